@@ -0,0 +1,255 @@
+"""Headless scoring of a multi-FASTA file.
+
+Runs the same pipeline as the app for every record, with the models
+preloaded, and writes one JSON line per protein as soon as it finishes::
+
+    python batch.py proteins.fasta [--mode BOTH] [--output results.jsonl] [--peptide-db peptides.sqlite] [--trace trace.json]
+                                   [--scan [--chunk-windows 16384]] [--workers 4]
+
+``--scan`` is for whole proteomes: the file is memory-mapped and indexed
+(``fasta.FastaIndex``) instead of parsed, and proteins are scored together
+in chunks of about ``--chunk-windows`` windows, one predict call per model
+per chunk. Resident memory is bounded by the chunk and the longest protein,
+not by the size of the file.
+
+``--workers N`` fans proteins (or, with ``--scan``, chunks) out to N forked
+worker processes. The models and the reference are loaded in the parent
+before the fork, so the workers share those pages copy-on-write instead of
+each unpickling its own copy; results are written in input order.
+"""
+import argparse
+import contextlib
+import gc
+import json
+import multiprocessing
+import multiprocessing.util
+import os
+import sys
+import time
+
+from Bio import SeqIO
+
+from fasta import FastaIndex
+from features import unscorable_residues
+from models import missing_models, preload
+from peptides import PeptideStore
+from pipeline import (MHC_CLASSES, MODES, class_jobs, json_default, predict_classes, predict_heads_many,
+                      protein_record, set_model_threads)
+from reference import REFERENCE_PATH, load_reference
+from tracing import enable, flush, fork_child, span
+
+CHUNK_WINDOWS = 16384
+
+# What a forked worker scores with; set in the parent just before the fork.
+_worker = {}
+
+
+def score_fasta(fasta, out, mode='BOTH', reference_path=REFERENCE_PATH, peptide_db=None, scan=False,
+                chunk_windows=CHUNK_WINDOWS, workers=1):
+    # Progress and model-load messages go to stderr so stdout can carry the JSON lines.
+    with contextlib.redirect_stdout(sys.stderr):
+        return _score_fasta(fasta, out, MODES[mode], reference_path, peptide_db, scan, chunk_windows, workers)
+
+
+def _nonempty(records):
+    for record_id, sequence in records:
+        if not sequence:
+            print(f"{record_id}: empty sequence, skipped")
+            continue
+        yield record_id, sequence
+
+
+def _scorable(record_id, sequence):
+    # Letters outside the 20 standard amino acids (U, X, B, ...) have no features; the record is skipped.
+    invalid = unscorable_residues(sequence)
+    if invalid:
+        print(f"{record_id}: non-standard residues ({''.join(invalid)}), skipped")
+    return not invalid
+
+
+def _each(records, reference, classes, store):
+    for record_id, sequence in records:
+        if not _scorable(record_id, sequence):
+            continue
+        with span('protein', request_id=record_id, residues=len(sequence)):
+            yield record_id, sequence, predict_classes(sequence, reference, classes, store)
+
+
+def _chunks(records, reference, classes, store, chunk_windows):
+    """Like ``_each``, but proteins are scored together in chunks of about ``chunk_windows`` windows."""
+    pending = []
+    windows = 0
+    for record_id, sequence in records:
+        # Checked before the protein joins a chunk: one unscorable record would fail every protein batched with it.
+        if not _scorable(record_id, sequence):
+            continue
+        configs, jobs = class_jobs(sequence, classes, store)
+        pending.append((record_id, sequence, configs, jobs))
+        windows += sum(len(job[2]) for job in jobs.values())
+        if windows >= chunk_windows:
+            yield from _score_chunk(pending, reference, classes, windows)
+            pending, windows = [], 0
+    yield from _score_chunk(pending, reference, classes, windows)
+
+
+def _score_chunk(pending, reference, classes, windows):
+    if not pending:
+        return
+    with span('chunk', proteins=len(pending), windows=windows):
+        by_config = {}
+        for _, _, _, jobs in pending:
+            for config, job in jobs.items():
+                by_config.setdefault(config, []).append(job)
+        heads = {config: iter(predict_heads_many(reference, config_jobs)) for config, config_jobs in by_config.items()}
+        scored = []
+        for record_id, sequence, configs, jobs in pending:
+            results = {config: next(heads[config]) for config in jobs}
+            scored.append((record_id, sequence, {mhc_class: results[configs[mhc_class]] for mhc_class in classes}))
+    yield from scored
+
+
+def _lines(scored):
+    # (id, residues, windows, JSON line) of every scored protein
+    for record_id, sequence, results in scored:
+        line = json.dumps(protein_record(record_id, sequence, results), default=json_default,
+                          allow_nan=False)
+        yield record_id, len(sequence), sum(len(result['final']) for result in results.values()), line
+
+
+def _batches(records, classes, chunk_windows):
+    # Records grouped into about ``chunk_windows`` windows, as ``_chunks`` would group them.
+    configs = {tuple(sorted(MHC_CLASSES[mhc_class].items())) for mhc_class in classes}
+    batch = []
+    windows = 0
+    for record in records:
+        batch.append(record)
+        windows += sum(max(len(record[1]) - dict(config)['window_size'] + 1, 0) for config in configs)
+        if windows >= chunk_windows:
+            yield batch
+            batch, windows = [], 0
+    if batch:
+        yield batch
+
+
+def _init_worker():
+    from threadpoolctl import threadpool_limits
+
+    # One OpenMP/BLAS thread and one model thread per worker: the workers are the parallelism.
+    threadpool_limits(1)
+    set_model_threads(1)
+    if fork_child():
+        multiprocessing.util.Finalize(None, flush, exitpriority=10)
+    if _worker['peptide_db']:
+        _worker['store'] = PeptideStore(_worker['peptide_db'])
+
+
+def _score_batch(batch):
+    state = _worker
+    store = state.get('store')
+    if state['scan']:
+        scored = _chunks(batch, state['reference'], state['classes'], store, state['chunk_windows'])
+    else:
+        scored = _each(batch, state['reference'], state['classes'], store)
+    return list(_lines(scored)), os.getpid(), store.report() if store is not None else None
+
+
+def _pooled(records, workers, reference, classes, peptide_db, scan, chunk_windows, reports):
+    """``_lines`` of every record, scored in ``workers`` forked processes and yielded in input order."""
+    _worker.update(reference=reference, classes=classes, peptide_db=peptide_db, scan=scan,
+                   chunk_windows=chunk_windows)
+    # Keeps the collector from writing to the shared objects' pages in the workers.
+    gc.freeze()
+    pool = multiprocessing.get_context('fork').Pool(workers, initializer=_init_worker)
+    try:
+        batches = _batches(records, classes, chunk_windows) if scan else ([record] for record in records)
+        for lines, pid, report in pool.imap(_score_batch, batches):
+            if report is not None:
+                reports[pid] = report
+            yield from lines
+        pool.close()
+    except BaseException:
+        pool.terminate()
+        raise
+    finally:
+        pool.join()
+        gc.unfreeze()
+
+
+def _score_fasta(fasta, out, classes, reference_path, peptide_db=None, scan=False, chunk_windows=CHUNK_WINDOWS,
+                 workers=1):
+    reference = load_reference(reference_path)
+    # Loaded before any fork, and nothing is predicted here first: OpenMP does not survive a fork once started.
+    preload()
+    workers = workers or os.cpu_count()
+    store = PeptideStore(peptide_db) if peptide_db and workers == 1 else None
+    reports = {}
+    proteins = residues = windows = 0
+    started = time.perf_counter()
+    with contextlib.ExitStack() as stack:
+        if scan:
+            index = stack.enter_context(FastaIndex(fasta))
+            print(f"{fasta}: {len(index)} records indexed in {time.perf_counter() - started:.2f}s")
+            records = _nonempty(index)
+        else:
+            records = _nonempty((record.id, str(record.seq)) for record in SeqIO.parse(fasta, 'fasta'))
+        if workers > 1:
+            lines = _pooled(records, workers, reference, classes, peptide_db, scan, chunk_windows, reports)
+        elif scan:
+            lines = _lines(_chunks(records, reference, classes, store, chunk_windows))
+        else:
+            lines = _lines(_each(records, reference, classes, store))
+        for record_id, length, record_windows, line in lines:
+            out.write(line + '\n')
+            out.flush()
+            proteins += 1
+            residues += length
+            windows += record_windows
+            print(f"{record_id}: {length} residues")
+    elapsed = time.perf_counter() - started
+    stats = {
+        'proteins': proteins,
+        'residues': residues,
+        'windows': windows,
+        'seconds': elapsed,
+        'residues_per_second': residues / elapsed if elapsed else 0.0,
+        'windows_per_second': windows / elapsed if elapsed else 0.0,
+        'workers': workers,
+    }
+    print(f"{proteins} proteins, {residues} residues, {windows} windows in {elapsed:.2f}s "
+          f"({stats['residues_per_second']:.0f} residues/s, {stats['windows_per_second']:.0f} windows/s)")
+    if store is not None:
+        reports[os.getpid()] = store.report()
+    if reports:
+        stats['peptides'] = {key: sum(report[key] for report in reports.values()) for key in next(iter(reports.values()))}
+        print(f"peptide store: {stats['peptides']['computed']} of {stats['peptides']['windows']} windows computed, "
+              f"{stats['peptides']['feature_seconds']:.3f}s feature time "
+              f"(computing every window directly: {stats['peptides']['estimated_direct_seconds']:.3f}s, estimated)")
+    return stats
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Score every protein in a multi-FASTA file.")
+    parser.add_argument('fasta')
+    parser.add_argument('--mode', choices=list(MODES), default='BOTH')
+    parser.add_argument('--output', help="JSON Lines output file (default: stdout)")
+    parser.add_argument('--reference', default=REFERENCE_PATH)
+    parser.add_argument('--peptide-db', help="sqlite file of per-peptide features reused across runs")
+    parser.add_argument('--trace', help="write a Chrome trace-event JSON file of the run")
+    parser.add_argument('--scan', action='store_true', help="memory-map the file and score proteins in window chunks")
+    parser.add_argument('--chunk-windows', type=int, default=CHUNK_WINDOWS,
+                        help="windows per chunk in --scan mode (default: %(default)s)")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="worker processes, 0 for one per CPU (default: %(default)s)")
+    args = parser.parse_args()
+    if args.trace:
+        enable(args.trace)
+    missing = missing_models()
+    if missing:
+        sys.exit("Missing model files: " + ", ".join(missing))
+    if args.output:
+        with open(args.output, 'w') as handle:
+            score_fasta(args.fasta, handle, args.mode, args.reference, args.peptide_db, args.scan, args.chunk_windows,
+                        args.workers)
+    else:
+        score_fasta(args.fasta, sys.stdout, args.mode, args.reference, args.peptide_db, args.scan, args.chunk_windows,
+                    args.workers)
@@ -0,0 +1,229 @@
+"""End-to-end benchmark over sequence length and MHC mode.
+
+Scores seeded synthetic proteins, drawn with UniProtKB/Swiss-Prot amino-acid
+frequencies, through the same pipeline as the app with the models preloaded,
+and writes one JSON report with wall time, time per stage, windows/s and peak
+RSS for every (length, mode) case::
+
+    python bench.py [--lengths 100 1000 10000 50000] [--modes MHC-1 MHC-2 BOTH] [--repeats 3] [--output bench.json]
+                    [--cascade]
+    python bench.py --scaling 1 2 4 8 [--proteins 200] [--protein-length 500] [--modes MHC-1] [--output scaling.json]
+
+Every case runs in its own interpreter so its peak RSS is not inflated by the
+cases before it; the peak includes the loaded models, reported separately as
+``baseline_rss_bytes``. With ``--cascade`` every case is also timed in
+cascade mode, and the report adds the windows pruned and the wall time saved.
+
+``--scaling`` instead scores one synthetic proteome with ``batch.py`` at each
+worker count and reports throughput, speedup and parallel efficiency against
+the first count, the scaling curve of ``batch.py --workers``.
+"""
+import argparse
+import contextlib
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from pipeline import MHC_CLASSES, MODES, predict_classes
+from reference import REFERENCE_PATH, load_reference
+
+LENGTHS = [100, 300, 1000, 3000, 10000, 30000, 50000]
+STAGES = ['features', 'targets', 'kolaskar', 'hla', 'nearest_hla', 'ranking']
+
+# UniProtKB/Swiss-Prot amino-acid composition, percent
+FREQUENCIES = {
+    'A': 8.25, 'R': 5.53, 'N': 4.06, 'D': 5.45, 'C': 1.37, 'Q': 3.93, 'E': 6.75, 'G': 7.07, 'H': 2.27, 'I': 5.96,
+    'L': 9.66, 'K': 5.84, 'M': 2.42, 'F': 3.86, 'P': 4.70, 'S': 6.56, 'T': 5.34, 'W': 1.08, 'Y': 2.92, 'V': 6.87,
+}
+
+
+def synthetic_protein(length, seed=0):
+    """The same sequence for the same ``(length, seed)``, whatever else is benchmarked."""
+    rng = np.random.default_rng([seed, length])
+    letters = np.array(list(FREQUENCIES))
+    weights = np.array(list(FREQUENCIES.values()))
+    return ''.join(rng.choice(letters, size=length, p=weights / weights.sum()))
+
+
+def peak_rss_bytes():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def _time_predictions(sequence, reference, classes, repeats, cascade):
+    walls = []
+    stages = {stage: [] for stage in STAGES}
+    for _ in range(repeats):
+        timings = {}
+        started = time.perf_counter()
+        results = predict_classes(sequence, reference, classes, timings=timings, cascade=cascade)
+        walls.append(time.perf_counter() - started)
+        for stage in STAGES:
+            stages[stage].append(timings.get(stage, 0.0))
+    return results, walls, {stage: statistics.median(values) for stage, values in stages.items()}
+
+
+def run_case(length, mode, repeats=3, seed=0, reference_path=REFERENCE_PATH, cascade=False):
+    """Times ``repeats`` predictions of one synthetic protein in this process; medians per stage."""
+    from models import preload
+
+    reference = load_reference(reference_path)
+    preload()
+    sequence = synthetic_protein(length, seed)
+    baseline = peak_rss_bytes()
+    results, walls, stages = _time_predictions(sequence, reference, MODES[mode], repeats, False)
+    windows = sum(len(result['final']) for result in results.values())
+    wall = statistics.median(walls)
+    case = {
+        'length': length,
+        'mode': mode,
+        'windows': windows,
+        'repeats': repeats,
+        'wall_seconds': wall,
+        'wall_seconds_min': min(walls),
+        'stage_seconds': stages,
+        'windows_per_second': windows / wall if wall else 0.0,
+        'baseline_rss_bytes': baseline,
+        'peak_rss_bytes': peak_rss_bytes(),
+    }
+    if cascade:
+        results, walls, stages = _time_predictions(sequence, reference, MODES[mode], repeats, True)
+        case['cascade'] = {
+            'pruned_windows': sum(result['cascade']['pruned'] for result in results.values()),
+            'wall_seconds': statistics.median(walls),
+            'stage_seconds': stages,
+            'seconds_saved': wall - statistics.median(walls),
+        }
+    return case
+
+
+def _isolated_case(length, mode, repeats, seed, reference_path, cascade=False):
+    completed = subprocess.run([sys.executable, __file__, '--case', str(length), mode, '--repeats', str(repeats),
+                                '--seed', str(seed), '--reference', reference_path] + ['--cascade'] * cascade,
+                               capture_output=True, text=True)
+    if completed.returncode != 0:
+        raise RuntimeError(f"benchmark case {length} {mode} failed:\n{completed.stderr}")
+    return json.loads(completed.stdout)
+
+
+def benchmark(lengths=LENGTHS, modes=list(MODES), repeats=3, seed=0, reference_path=REFERENCE_PATH, cascade=False):
+    cases = []
+    for length in lengths:
+        for mode in modes:
+            case = _isolated_case(length, mode, repeats, seed, reference_path, cascade)
+            print(f"{length:>6} {mode:<6} {case['windows']:>6} windows {case['wall_seconds']:8.3f}s "
+                  f"{case['windows_per_second']:10.0f} windows/s {case['peak_rss_bytes'] / 2 ** 20:8.1f} MiB peak",
+                  file=sys.stderr)
+            if cascade:
+                print(f"{'':>13} cascade: {case['cascade']['pruned_windows']:>6} pruned "
+                      f"{case['cascade']['wall_seconds']:8.3f}s, {case['cascade']['seconds_saved']:.3f}s saved",
+                      file=sys.stderr)
+            cases.append(case)
+    return {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'seed': seed,
+        'classes': {mode: {mhc_class: MHC_CLASSES[mhc_class] for mhc_class in MODES[mode]} for mode in modes},
+        'cases': cases,
+    }
+
+
+def run_scaling_case(fasta, workers, mode, reference_path=REFERENCE_PATH):
+    """Scores ``fasta`` with ``batch.py --workers workers`` in this process; the batch run's stats."""
+    from batch import score_fasta
+
+    with open(os.devnull, 'w') as out:
+        stats = score_fasta(fasta, out, mode, reference_path, workers=workers)
+    stats['peak_rss_bytes'] = peak_rss_bytes()
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    stats['worker_peak_rss_bytes'] = children if sys.platform == 'darwin' else children * 1024
+    return stats
+
+
+def _isolated_scaling_case(fasta, workers, mode, reference_path):
+    completed = subprocess.run([sys.executable, __file__, '--scaling-case', fasta, str(workers), mode,
+                                '--reference', reference_path], capture_output=True, text=True)
+    if completed.returncode != 0:
+        raise RuntimeError(f"scaling case {workers} workers {mode} failed:\n{completed.stderr}")
+    return json.loads(completed.stdout)
+
+
+def scaling(workers=(1, 2, 4), modes=('MHC-1',), proteins=200, length=500, seed=0, reference_path=REFERENCE_PATH):
+    cases = []
+    with tempfile.TemporaryDirectory() as directory:
+        fasta = os.path.join(directory, 'proteome.fasta')
+        with open(fasta, 'w') as handle:
+            for i in range(proteins):
+                handle.write(f">synthetic_{i}\n{synthetic_protein(length, seed + i)}\n")
+        for mode in modes:
+            first = None
+            for count in workers:
+                case = dict(_isolated_scaling_case(fasta, count, mode, reference_path), mode=mode)
+                first = first or case
+                case['proteins_per_second'] = case['proteins'] / case['seconds'] if case['seconds'] else 0.0
+                case['speedup'] = first['seconds'] / case['seconds'] if case['seconds'] else 0.0
+                case['efficiency'] = case['speedup'] * first['workers'] / count
+                print(f"{count:>3} workers {mode:<6} {case['seconds']:8.2f}s {case['proteins_per_second']:8.1f} proteins/s "
+                      f"{case['speedup']:5.2f}x {case['efficiency']:6.1%} efficiency", file=sys.stderr)
+                cases.append(case)
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'proteins': proteins,
+        'protein_length': length,
+        'seed': seed,
+        'cases': cases,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the pipeline over sequence length and MHC mode.")
+    parser.add_argument('--lengths', type=int, nargs='+', default=LENGTHS)
+    parser.add_argument('--modes', nargs='+', choices=list(MODES), default=list(MODES))
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--reference', default=REFERENCE_PATH)
+    parser.add_argument('--output', help="JSON report file (default: stdout)")
+    parser.add_argument('--cascade', action='store_true', help="also time every case in cascade mode")
+    parser.add_argument('--scaling', type=int, nargs='+', metavar='WORKERS',
+                        help="measure batch.py throughput at these worker counts instead")
+    parser.add_argument('--proteins', type=int, default=200, help="proteins in the --scaling proteome")
+    parser.add_argument('--protein-length', type=int, default=500)
+    parser.add_argument('--case', nargs=2, metavar=('LENGTH', 'MODE'), help=argparse.SUPPRESS)
+    parser.add_argument('--scaling-case', nargs=3, metavar=('FASTA', 'WORKERS', 'MODE'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.scaling_case:
+        case = run_scaling_case(args.scaling_case[0], int(args.scaling_case[1]), args.scaling_case[2], args.reference)
+        print(json.dumps(case))
+        sys.exit(0)
+    if args.case:
+        # Model-load messages go to stderr so stdout carries only the case's JSON.
+        with contextlib.redirect_stdout(sys.stderr):
+            case = run_case(int(args.case[0]), args.case[1], args.repeats, args.seed, args.reference, args.cascade)
+        print(json.dumps(case))
+        sys.exit(0)
+    from models import missing_models
+
+    missing = missing_models()
+    if missing:
+        sys.exit("Missing model files: " + ", ".join(missing))
+    if args.scaling:
+        report = scaling(args.scaling, args.modes, args.proteins, args.protein_length, args.seed, args.reference)
+    else:
+        report = benchmark(args.lengths, args.modes, args.repeats, args.seed, args.reference, args.cascade)
+    if args.output:
+        with open(args.output, 'w') as handle:
+            json.dump(report, handle, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
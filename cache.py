@@ -0,0 +1,175 @@
+"""Content-addressed cache of prediction results.
+
+Results are keyed by the normalized sequence, the prediction option, the
+class configuration, the ranking and cascade settings and the sha256 of every model file and of the reference
+artifact, so replacing a pickle or rebuilding the reference invalidates
+them. Two LRU tiers, each capped in bytes: pickled results in memory and
+the same pickles under ``CANCERPROVAX_CACHE_DIR`` on disk. The cache lives in
+this module, so it survives Streamlit reruns like the model registry.
+"""
+import collections
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+import threading
+
+from features import check_sequence
+from models import model_versions
+from peptides import default_store
+from pipeline import CASCADE, MHC_CLASSES, MODES, RANK_COLUMN, RANK_LIMIT, predict_classes
+from tracing import span
+
+CACHE_DIR = os.environ.get('CANCERPROVAX_CACHE_DIR', os.path.join('.cache', 'results'))
+MEMORY_BYTES = int(os.environ.get('CANCERPROVAX_CACHE_MEMORY_BYTES', 256 * 2 ** 20))
+DISK_BYTES = int(os.environ.get('CANCERPROVAX_CACHE_DISK_BYTES', 2 * 2 ** 30))
+CACHE_VERSION = 3
+
+_default = None
+_default_lock = threading.Lock()
+
+
+def normalize(sequence):
+    return ''.join(sequence.split()).upper()
+
+
+def cache_key(sequence, option, reference_sha256, versions):
+    payload = {
+        'version': CACHE_VERSION,
+        'sequence': hashlib.sha256(normalize(sequence).encode()).hexdigest(),
+        'option': option,
+        'classes': {mhc_class: MHC_CLASSES[mhc_class] for mhc_class in MODES[option]},
+        'ranking': [RANK_LIMIT, RANK_COLUMN],
+        'cascade': CASCADE,
+        'models': versions,
+        'reference': reference_sha256,
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+
+class ResultCache:
+
+    def __init__(self, directory=CACHE_DIR, memory_bytes=MEMORY_BYTES, disk_bytes=DISK_BYTES):
+        self.directory = directory
+        self.memory_bytes = memory_bytes
+        self.disk_bytes = disk_bytes
+        self.counters = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0, 'stores': 0,
+                         'memory_evictions': 0, 'disk_evictions': 0}
+        self._memory = collections.OrderedDict()
+        self._memory_used = 0
+        self._disk = collections.OrderedDict()
+        self._disk_used = 0
+        self._lock = threading.Lock()
+        if directory and disk_bytes > 0:
+            os.makedirs(directory, exist_ok=True)
+            entries = []
+            for file_name in os.listdir(directory):
+                if file_name.endswith('.pkl'):
+                    stat = os.stat(os.path.join(directory, file_name))
+                    entries.append((stat.st_mtime_ns, file_name[:-4], stat.st_size))
+            for _, key, size in sorted(entries):
+                self._disk[key] = size
+                self._disk_used += size
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + '.pkl')
+
+    def _remember(self, key, data):
+        if len(data) > self.memory_bytes:
+            return
+        if key in self._memory:
+            self._memory_used -= len(self._memory.pop(key))
+        self._memory[key] = data
+        self._memory_used += len(data)
+        while self._memory_used > self.memory_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_used -= len(evicted)
+            self.counters['memory_evictions'] += 1
+
+    def _read_disk(self, key):
+        if key not in self._disk:
+            return None
+        try:
+            with open(self._path(key), 'rb') as handle:
+                data = handle.read()
+            os.utime(self._path(key))
+        except OSError:
+            self._disk_used -= self._disk.pop(key)
+            return None
+        self._disk.move_to_end(key)
+        return data
+
+    def _write_disk(self, key, data):
+        if not self.directory or len(data) > self.disk_bytes:
+            return
+        descriptor, temporary = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(descriptor, 'wb') as handle:
+            handle.write(data)
+        os.replace(temporary, self._path(key))
+        if key in self._disk:
+            self._disk_used -= self._disk.pop(key)
+        self._disk[key] = len(data)
+        self._disk_used += len(data)
+        while self._disk_used > self.disk_bytes:
+            evicted, size = self._disk.popitem(last=False)
+            self._disk_used -= size
+            self.counters['disk_evictions'] += 1
+            try:
+                os.remove(self._path(evicted))
+            except OSError:
+                pass
+
+    def get(self, key):
+        with self._lock:
+            data = self._memory.get(key)
+            if data is not None:
+                self._memory.move_to_end(key)
+                self.counters['memory_hits'] += 1
+                return pickle.loads(data)
+            data = self._read_disk(key)
+            if data is None:
+                self.counters['misses'] += 1
+                return None
+            self.counters['disk_hits'] += 1
+            self._remember(key, data)
+            return pickle.loads(data)
+
+    def put(self, key, value):
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._remember(key, data)
+            self._write_disk(key, data)
+            self.counters['stores'] += 1
+
+    def report(self):
+        with self._lock:
+            return dict(self.counters, memory_entries=len(self._memory), memory_bytes=self._memory_used,
+                        disk_entries=len(self._disk), disk_bytes=self._disk_used)
+
+
+def default_cache():
+    global _default
+    with _default_lock:
+        if _default is None:
+            _default = ResultCache()
+        return _default
+
+
+def predict_cached(sequence, reference, option, cache=None):
+    """``predict_classes`` for ``option`` through the result cache; returns (results, hit).
+
+    Raises ValueError if the normalized sequence is empty or cannot be scored.
+    """
+    cache = cache or default_cache()
+    sequence = normalize(sequence)
+    check_sequence(sequence)
+    with span('cache_get'):
+        key = cache_key(sequence, option, reference['sha256'], model_versions())
+        results = cache.get(key)
+    if results is not None:
+        return results, True
+    results = predict_classes(sequence, reference, MODES[option], default_store())
+    with span('cache_put'):
+        cache.put(key, results)
+    return results, False
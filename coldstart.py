@@ -0,0 +1,71 @@
+"""Cold-start import report and budget check.
+
+Imports a module in fresh interpreters with ``-X importtime``, prints the
+slowest imports, and exits non-zero if the best of the runs exceeds the
+budget or if a library that only the unpickled models or the offline tools
+need was imported up front::
+
+    python coldstart.py [app] [--budget-ms 600] [--runs 3] [--top 15] [--deferred xgboost ...]
+"""
+import argparse
+import re
+import subprocess
+import sys
+
+BUDGET_MS = 600
+# Libraries the app must not import up front: unpickling the models loads them on first prediction.
+DEFERRED = ['xgboost', 'lightgbm', 'sklearn', 'scipy']
+
+_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$')
+
+
+def import_times(module):
+    completed = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                               capture_output=True, text=True)
+    if completed.returncode != 0:
+        raise RuntimeError(f"importing {module} failed:\n{completed.stderr}")
+    rows = []
+    for line in completed.stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            rows.append({'module': name, 'self_ms': int(self_us) / 1000, 'cumulative_ms': int(cumulative_us) / 1000,
+                         'depth': len(indent) // 2})
+    return rows
+
+
+def deferred_violations(rows, deferred=DEFERRED):
+    names = {row['module'] for row in rows}
+    return [lib for lib in deferred if any(name == lib or name.startswith(lib + '.') for name in names)]
+
+
+def check(module='app', budget_ms=BUDGET_MS, runs=3, top=15, deferred=DEFERRED):
+    runs = [import_times(module) for _ in range(runs)]
+    totals = [next(row['cumulative_ms'] for row in rows if row['module'] == module) for rows in runs]
+    best = runs[totals.index(min(totals))]
+    print(f"import {module}: best {min(totals):.0f} ms of {len(totals)} runs "
+          f"({', '.join(f'{total:.0f}' for total in totals)}), budget {budget_ms:.0f} ms")
+    print(f"{'cumulative ms':>14} {'self ms':>8}  module")
+    for row in sorted(best, key=lambda row: row['cumulative_ms'], reverse=True)[:top]:
+        print(f"{row['cumulative_ms']:14.1f} {row['self_ms']:8.1f}  {'  ' * row['depth']}{row['module']}")
+    failures = []
+    if min(totals) > budget_ms:
+        failures.append(f"import {module} took {min(totals):.0f} ms, over the {budget_ms:.0f} ms budget")
+    violations = deferred_violations(best, deferred)
+    if violations:
+        failures.append(f"imported at startup but should load on demand: {', '.join(violations)}")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return not failures
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Report import times and enforce a cold-start budget.")
+    parser.add_argument('module', nargs='?', default='app')
+    parser.add_argument('--budget-ms', type=float, default=BUDGET_MS)
+    parser.add_argument('--runs', type=int, default=3)
+    parser.add_argument('--top', type=int, default=15)
+    parser.add_argument('--deferred', nargs='*', default=DEFERRED,
+                        help="packages that must not be imported (default: %(default)s)")
+    args = parser.parse_args()
+    sys.exit(0 if check(args.module, args.budget_ms, args.runs, args.top, args.deferred) else 1)
@@ -0,0 +1,93 @@
+"""Offline evaluation of the shipped models against the reference artifact.
+
+Interactive prediction does no scoring of its own. This command produces a
+metrics report per model version (model file sha256 + reference sha256) and
+caches it under ``metrics/``, so unchanged models are not re-evaluated::
+
+    python evaluate.py [--force] [--seed 0] [model.pkl ...]
+"""
+import argparse
+import json
+import os
+import time
+
+import joblib
+from sklearn.metrics import classification_report
+from sklearn.model_selection import train_test_split
+
+from reference import REFERENCE_PATH, file_sha256, load_reference
+from schema import HLA_COLUMNS, SCHEMAS, SCORE_COLUMNS, TARGET_COLUMNS
+
+METRICS_DIR = 'metrics'
+
+# model file -> (reference table, feature columns, label column, classifier?, train_test_split kwargs)
+EVALUATIONS = {
+    'Bagging_tar_mhc1.pkl': ('target', TARGET_COLUMNS, 'Target', True, {}),
+    'extratree_tar_mhc1.pkl': ('target', TARGET_COLUMNS, 'Target', True, {}),
+    'randomforest_tar_mhc1.pkl': ('target', TARGET_COLUMNS, 'Target', True, {}),
+    'xgb_score_mhc1.pkl': ('score', SCORE_COLUMNS, 'Kolaskar.Tongaonkar.Score', False, {'train_size': 0.4}),
+    'lgb_score_mhc1.pkl': ('score', SCORE_COLUMNS, 'Kolaskar.Tongaonkar.Score', False, {'train_size': 0.4}),
+    'extra_tree_hla_mhc1.pkl': ('hla', HLA_COLUMNS, 'hla', False, {'test_size': 0.7}),
+    'xgbr_hla_mhc1.pkl': ('hla', HLA_COLUMNS, 'hla', False, {'test_size': 0.7}),
+    'hist_hla_mhc1.pkl': ('hla', HLA_COLUMNS, 'hla', False, {'test_size': 0.7}),
+}
+
+
+def report_path(model_file, model_sha, reference_sha, seed, out_dir=METRICS_DIR):
+    stem = os.path.splitext(os.path.basename(model_file))[0]
+    return os.path.join(out_dir, f"{stem}-{model_sha[:12]}-{reference_sha[:12]}-seed{seed}.json")
+
+
+def evaluate_model(model_file, tables, seed=0):
+    table_name, columns, label, classifier, split = EVALUATIONS[os.path.basename(model_file)]
+    table = tables[table_name]
+    x_train, x_test, y_train, y_test = train_test_split(table[columns], table[label], random_state=seed, **split)
+    model = joblib.load(model_file)
+    SCHEMAS[table_name].check(model, model_file)
+    started = time.perf_counter()
+    predicted = model.predict(x_test)
+    report = {
+        'table': table_name,
+        'test_rows': len(x_test),
+        'score': float(model.score(x_test, y_test)),
+        'predict_seconds': time.perf_counter() - started,
+    }
+    if classifier:
+        report['classification_report'] = classification_report(y_test, predicted, output_dict=True)
+    return report
+
+
+def evaluate(model_files, reference_path=REFERENCE_PATH, seed=0, out_dir=METRICS_DIR, force=False):
+    artifact = load_reference(reference_path)
+    os.makedirs(out_dir, exist_ok=True)
+    reports = {}
+    for model_file in model_files:
+        if not os.path.exists(model_file):
+            print(f"{model_file}: missing, skipped")
+            continue
+        model_sha = file_sha256(model_file)
+        path = report_path(model_file, model_sha, artifact['sha256'], seed, out_dir)
+        if os.path.exists(path) and not force:
+            with open(path) as handle:
+                reports[model_file] = json.load(handle)
+            print(f"{model_file}: cached {path}")
+            continue
+        report = evaluate_model(model_file, artifact['tables'], seed)
+        report.update({'model': model_file, 'model_sha256': model_sha,
+                       'reference_sha256': artifact['sha256'], 'seed': seed})
+        with open(path, 'w') as handle:
+            json.dump(report, handle, indent=2)
+        reports[model_file] = report
+        print(f"{model_file}: score {report['score']:.4f} -> {path}")
+    return reports
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Evaluate the prediction models offline.")
+    parser.add_argument('models', nargs='*', default=list(EVALUATIONS))
+    parser.add_argument('--reference', default=REFERENCE_PATH)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--out-dir', default=METRICS_DIR)
+    parser.add_argument('--force', action='store_true', help="re-evaluate even if a cached report exists")
+    args = parser.parse_args()
+    evaluate(args.models, args.reference, args.seed, args.out_dir, args.force)
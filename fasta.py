@@ -0,0 +1,109 @@
+"""Memory-mapped multi-FASTA index.
+
+``FastaIndex`` maps the file read-only and records where every record's
+header and sequence start, as three int64 offsets per record; no sequence is
+copied until it is read. Reading a record copies only that record, with the
+same id and sequence ``Bio.SeqIO.parse(path, 'fasta')`` gives, and pages of
+the mapping that have been read are handed back to the kernel, so resident
+memory grows by the 24 bytes of offsets per record, not with the size of the
+file::
+
+    python fasta.py proteome.fasta
+"""
+import argparse
+import mmap
+import os
+from array import array
+
+import numpy as np
+
+# Mapped pages behind the read position are released in steps of this many bytes.
+RELEASE_BYTES = 16 * 2 ** 20
+
+_WHITESPACE = b' \t\r\n\v\f'
+
+
+class FastaIndex:
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'rb')
+        size = os.fstat(self._file.fileno()).st_size
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+        self._released = 0
+        self.headers, self.sequences, self.ends = self._scan(size)
+
+    def _scan(self, size):
+        headers, sequences = array('q'), array('q')
+        # Like SeqIO, anything before the first header is ignored.
+        found = -1 if self._map is None else 0 if self._map[:1] == b'>' else self._map.find(b'\n>')
+        if found >= 0:
+            self._advise('MADV_SEQUENTIAL', 0, size)
+            found += self._map[found:found + 1] == b'\n'
+            while found >= 0:
+                line_end = self._map.find(b'\n', found)
+                headers.append(found)
+                sequences.append(size if line_end < 0 else line_end + 1)
+                found = -1 if line_end < 0 else self._map.find(b'\n>', line_end)
+                if found >= 0:
+                    found += 1
+                    self._release(found)
+            self._release(size, force=True)
+            self._released = 0
+        headers = np.frombuffer(headers, dtype=np.int64) if headers else np.empty(0, np.int64)
+        sequences = np.frombuffer(sequences, dtype=np.int64) if sequences else np.empty(0, np.int64)
+        return headers, sequences, np.append(headers[1:], size).astype(np.int64)
+
+    def _advise(self, option, start, length):
+        if hasattr(mmap, option) and length > 0:
+            self._map.madvise(getattr(mmap, option), start, length)
+
+    def _release(self, offset, force=False):
+        # Drops the clean, file-backed pages before ``offset`` from this process; they are reread if needed.
+        offset -= offset % mmap.PAGESIZE
+        if offset - self._released >= (0 if force else RELEASE_BYTES):
+            self._advise('MADV_DONTNEED', self._released, offset - self._released)
+            self._released = offset
+
+    def __len__(self):
+        return len(self.headers)
+
+    @property
+    def size(self):
+        return 0 if self._map is None else len(self._map)
+
+    def record_id(self, i):
+        header = self._map[self.headers[i] + 1:self.sequences[i]].split(None, 1)
+        return header[0].decode() if header else ''
+
+    def sequence(self, i):
+        return self._map[self.sequences[i]:self.ends[i]].translate(None, _WHITESPACE).decode()
+
+    def __iter__(self):
+        """``(id, sequence)`` of every record in file order, releasing the pages already read."""
+        self._released = 0
+        for i in range(len(self)):
+            yield self.record_id(i), self.sequence(i)
+            self._release(int(self.ends[i]))
+        if self._map is not None:
+            self._release(self.size, force=True)
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Index a multi-FASTA file and report its records.")
+    parser.add_argument('fasta')
+    args = parser.parse_args()
+    with FastaIndex(args.fasta) as index:
+        residues = sum(len(sequence) for _, sequence in index)
+        print(f"{args.fasta}: {len(index)} records, {residues} residues, {index.size} bytes")
@@ -0,0 +1,299 @@
+"""Sliding-window peptide features computed for all windows at once.
+
+The sequence is integer-encoded once and every per-window quantity is read
+off prefix counts or accumulated for all windows in lockstep, so the cost no
+longer depends on calling Biopython for each window. The columns and their
+meaning follow ``process_single_protein`` in the original app (Biopython
+1.83 ``ProteinAnalysis`` semantics). Windows are kept as ``WindowFeatures``:
+per-window residue counts and five float64 quantities, from which the
+float64 columns are rebuilt exactly when the models need them.
+"""
+import numpy as np
+import pandas as pd
+from Bio.Data.IUPACData import protein_weights
+from Bio.SeqUtils.IsoelectricPoint import negative_pKs, pKcterminal, pKnterminal, positive_pKs
+from Bio.SeqUtils.ProtParamData import DIWV, kd
+
+AMINO_ACIDS = ['A', 'R', 'N', 'D', 'C', 'E', 'Q', 'G', 'H', 'I', 'L', 'K', 'M', 'F', 'P', 'S', 'T', 'W', 'Y', 'V']
+INVALID = len(AMINO_ACIDS)
+
+WINDOW_COLUMNS = ['start', 'end', 'H_Count', 'C_Count', 'N_Count', 'O_Count', 'S_Count', 'TotalAtoms_Count',
+                  'Theoretical.pI', 'Aliphatic.Index', 'Positive.Residues', 'Negative.Residues',
+                  'Aromatic.Count', 'Polar.Count', 'Nonpolar.Count'] + \
+                 [aa + '_Percent' for aa in AMINO_ACIDS] + \
+                 ['Molecular.Weight', 'Instability.Index', 'Aromaticity', 'Helix.Fraction', 'Strand.Fraction',
+                  'Coil.Fraction', 'Charge.at.pH.7.0', 'Gravy', 'Amphipathicity', 'GRAVY.Last.50',
+                  'Molar.Extinction.Coefficient']
+
+# float64 fields of a ``window_stats`` record besides the residue counts
+SUM_FIELDS = ['kd', 'weight', 'diwv', 'pI', 'charge']
+
+ATOMS = {
+    'A': [5, 3, 1, 1, 0], 'R': [17, 6, 4, 2, 0], 'N': [8, 4, 2, 2, 0], 'D': [7, 4, 1, 3, 0],
+    'C': [7, 3, 1, 1, 1], 'E': [9, 5, 1, 3, 0], 'Q': [10, 5, 2, 2, 0], 'G': [3, 2, 1, 1, 0],
+    'H': [11, 6, 3, 2, 0], 'I': [11, 6, 1, 2, 0], 'L': [11, 6, 1, 2, 0], 'K': [14, 6, 2, 2, 0],
+    'M': [11, 5, 1, 2, 1], 'F': [11, 9, 1, 1, 0], 'P': [9, 5, 1, 1, 0], 'S': [9, 3, 1, 2, 0],
+    'T': [11, 4, 1, 2, 0], 'W': [14, 11, 2, 1, 0], 'Y': [12, 6, 1, 3, 0], 'V': [9, 5, 1, 1, 0]
+}
+WATER = 18.0153
+
+_CODE = np.full(256, INVALID, dtype=np.int8)
+for _i, _aa in enumerate(AMINO_ACIDS):
+    _CODE[ord(_aa)] = _i
+
+_INDEX = {aa: i for i, aa in enumerate(AMINO_ACIDS)}
+_ATOMS = np.array([ATOMS[aa] for aa in AMINO_ACIDS], dtype=np.int64)
+# Indexed by residue code; the trailing 0.0 is for non-standard letters, whose windows are masked anyway.
+_KD = np.array([kd[aa] for aa in AMINO_ACIDS] + [0.0])
+_WEIGHT = np.array([protein_weights[aa] for aa in AMINO_ACIDS] + [0.0])
+_DIWV = np.array([[DIWV[a][b] for b in AMINO_ACIDS] for a in AMINO_ACIDS] + [[0.0] * len(AMINO_ACIDS)])
+_DIWV = np.hstack([_DIWV, np.zeros((len(AMINO_ACIDS) + 1, 1))])
+_NTERM_PK = np.array([pKnterminal.get(aa, positive_pKs['Nterm']) for aa in AMINO_ACIDS] + [positive_pKs['Nterm']])
+_CTERM_PK = np.array([pKcterminal.get(aa, negative_pKs['Cterm']) for aa in AMINO_ACIDS] + [negative_pKs['Cterm']])
+
+
+def _idx(letters):
+    return [_INDEX[aa] for aa in letters]
+
+
+def encode(sequence):
+    codes = np.frombuffer(sequence.upper().encode('ascii', 'replace'), dtype=np.uint8)
+    return _CODE[codes]
+
+
+def _prefix_counts(codes):
+    one_hot = np.zeros((len(codes) + 1, INVALID + 1), dtype=np.int32)
+    one_hot[np.arange(1, len(codes) + 1), codes] = 1
+    return np.cumsum(one_hot, axis=0, out=one_hot)
+
+
+def _charge_at_pH(pH, charged, nterm_pk, cterm_pk):
+    positive = 1.0 / (10 ** (pH - nterm_pk) + 1.0)
+    for aa in 'KRH':
+        positive = positive + charged[aa] * (1.0 / (10 ** (pH - positive_pKs[aa]) + 1.0))
+    negative = 1.0 / (10 ** (cterm_pk - pH) + 1.0)
+    for aa in 'DECY':
+        negative = negative + charged[aa] * (1.0 / (10 ** (negative_pKs[aa] - pH) + 1.0))
+    return positive - negative
+
+
+def _isoelectric_point(charged, nterm_pk, cterm_pk):
+    # Same bisection as Bio.SeqUtils.IsoelectricPoint.pi, run for every window in lockstep.
+    n = len(nterm_pk)
+    pH = np.full(n, 7.775)
+    lo = np.full(n, 4.05)
+    hi = np.full(n, 12.0)
+    active = np.ones(n, dtype=bool)
+    while active.any():
+        charge = _charge_at_pH(pH[active], {aa: c[active] for aa, c in charged.items()},
+                               nterm_pk[active], cterm_pk[active])
+        still = (hi[active] - lo[active]) > 0.0001
+        idx = np.flatnonzero(active)
+        step = idx[still]
+        up = charge[still] > 0.0
+        lo[step[up]] = pH[step[up]]
+        hi[step[~up]] = pH[step[~up]]
+        pH[step] = (lo[step] + hi[step]) / 2
+        active[idx[~still]] = False
+    return pH
+
+
+def _window_sums(values, starts, length):
+    # Left-to-right sum of values[s:s + length] for each start, the order Biopython adds them in, so a
+    # window's value does not depend on where in the sequence it sits.
+    if length > 64:
+        return np.array([np.cumsum(values[s:s + length])[-1] for s in starts])
+    total = np.zeros(len(starts))
+    for offset in range(length):
+        total = total + values[starts + offset]
+    return total
+
+
+def stats_dtype(window_size):
+    """Record of one window's residue counts (last slot: non-standard letters) and float64 sums."""
+    counts = np.uint8 if window_size <= np.iinfo(np.uint8).max else np.uint32
+    return np.dtype([('counts', counts, (INVALID + 1,)), ('sums', np.float64, (len(SUM_FIELDS),))])
+
+
+def window_stats(codes, starts, window_size):
+    """The quantities every window feature is derived from, one ``stats_dtype`` record per window.
+
+    Only these involve the residue order or the pI bisection; ``feature_matrix`` builds the columns from them.
+    """
+    starts = np.asarray(starts, dtype=np.int64)
+    ends = starts + window_size
+
+    prefix = _prefix_counts(codes)
+    counts = (prefix[ends] - prefix[starts]).astype(np.int64)
+    pairs = _DIWV[codes[:-1], codes[1:]] if len(codes) > 1 else np.zeros(0)
+    charged = {aa: counts[:, _INDEX[aa]].astype(float) for aa in 'KRHDECY'}
+    nterm_pk = _NTERM_PK[codes[starts]]
+    cterm_pk = _CTERM_PK[codes[ends - 1]]
+
+    stats = np.empty(len(starts), dtype=stats_dtype(window_size))
+    stats['counts'] = counts
+    sums = stats['sums']
+    sums[:, 0] = _window_sums(_KD[codes], starts, window_size)
+    sums[:, 1] = _window_sums(_WEIGHT[codes], starts, window_size)
+    sums[:, 2] = _window_sums(pairs, starts, window_size - 1)
+    sums[:, 3] = _isoelectric_point(charged, nterm_pk, cterm_pk)
+    sums[:, 4] = _charge_at_pH(7.0, charged, nterm_pk, cterm_pk)
+    return stats
+
+
+def feature_matrix(starts, stats, window_size):
+    """Feature matrix (rows = windows starting at ``starts``, columns = WINDOW_COLUMNS) from ``window_stats``."""
+    starts = np.asarray(starts, dtype=np.int64)
+    w = float(window_size)
+
+    counts = stats['counts'].astype(np.int64)
+    kd_sum, weight_sum, pair_sum, pI, charge = stats['sums'].T
+    valid = counts[:, INVALID] == 0
+    aa_counts = counts[:, :INVALID]
+
+    instability = (10.0 / w) * pair_sum
+    atoms = aa_counts @ _ATOMS
+    fractions = aa_counts / w
+    aromaticity = fractions[:, _idx('YWF')].sum(axis=1)
+
+    out = np.empty((len(starts), len(WINDOW_COLUMNS)))
+    out[:, 0] = starts
+    out[:, 1] = starts + window_size - 1
+    out[:, 2:7] = atoms
+    out[:, 7] = atoms.sum(axis=1)
+    out[:, 8] = pI
+    out[:, 9] = kd_sum / w
+    out[:, 10] = aa_counts[:, _idx('RKH')].sum(axis=1)
+    out[:, 11] = aa_counts[:, _idx('DE')].sum(axis=1)
+    out[:, 12] = aromaticity * w
+    out[:, 13] = aa_counts[:, _idx('STNQ')].sum(axis=1)
+    out[:, 14] = aa_counts.sum(axis=1)
+    out[:, 15:35] = fractions
+    out[:, 35] = weight_sum - (w - 1) * WATER
+    out[:, 36] = instability
+    out[:, 37] = aromaticity
+    out[:, 38] = fractions[:, _idx('EMALK')].sum(axis=1)
+    out[:, 39] = fractions[:, _idx('NPGSD')].sum(axis=1)
+    out[:, 40] = fractions[:, _idx('VIYFWLT')].sum(axis=1)
+    out[:, 41] = charge
+    out[:, 42] = kd_sum / w
+    out[:, 43] = kd_sum - kd_sum / w
+    out[:, 44] = kd_sum / w
+    # Biopython returns (reduced, cystines); only the reduced coefficient is kept.
+    out[:, 45] = aa_counts[:, _INDEX['W']] * 5500 + aa_counts[:, _INDEX['Y']] * 1490
+    # Windows with non-standard letters have no physicochemical properties.
+    out[~valid, 8:] = np.nan
+    return out
+
+
+def window_feature_matrix(codes, starts, window_size):
+    """Feature matrix (rows = windows starting at ``starts``, columns = WINDOW_COLUMNS)."""
+    return feature_matrix(starts, window_stats(codes, starts, window_size), window_size)
+
+
+# WINDOW_COLUMNS held as int64 in the DataFrame whenever no window is missing them
+INTEGER_COLUMNS = WINDOW_COLUMNS[:8] + ['Positive.Residues', 'Negative.Residues', 'Polar.Count', 'Nonpolar.Count']
+
+
+class WindowFeatures:
+    """Every ``window_size`` window of ``sequence``: int32 starts and one packed ``window_stats`` record each.
+
+    Peptides are offsets into ``sequence``, and ``matrix`` rebuilds the float64 feature columns exactly, so a
+    window costs 65 bytes instead of a row of 46 floats and a string.
+    """
+
+    def __init__(self, sequence, window_size, stats, starts=None):
+        self.sequence = sequence
+        self.window_size = window_size
+        self.stats = stats
+        self.starts = np.arange(len(stats), dtype=np.int32) if starts is None else np.asarray(starts, np.int32)
+
+    def __len__(self):
+        return len(self.starts)
+
+    @property
+    def start(self):
+        return self.starts.astype(np.int64)
+
+    @property
+    def end(self):
+        return self.start + self.window_size - 1
+
+    @property
+    def epitopes(self):
+        size = self.window_size
+        return np.array([self.sequence[s:s + size] for s in self.starts.tolist()], dtype=object)
+
+    @property
+    def nbytes(self):
+        return self.starts.nbytes + self.stats.nbytes
+
+    def matrix(self):
+        """The float64 WINDOW_COLUMNS matrix, identical to ``window_feature_matrix`` on the same windows."""
+        return feature_matrix(self.starts, self.stats, self.window_size)
+
+    def frame(self):
+        """The windows as a DataFrame shaped like ``process_single_protein`` rows, for display and export."""
+        df = pd.DataFrame(self.matrix(), columns=WINDOW_COLUMNS)
+        for col in INTEGER_COLUMNS:
+            if not df[col].isna().any():
+                df[col] = df[col].astype(np.int64)
+        df.insert(0, 'epitope', list(self.epitopes))
+        return df
+
+
+def window_features(sequence, window_size=10, store=None):
+    """All ``window_size`` windows of ``sequence`` as ``WindowFeatures``.
+
+    With a ``peptides.PeptideStore``, statistics of peptides it has already seen are reused.
+    """
+    if store is not None:
+        stats = store.window_stats(sequence, window_size)
+    else:
+        stats = window_stats(encode(sequence), np.arange(max(len(sequence) - window_size + 1, 0)), window_size)
+    return WindowFeatures(sequence, window_size, stats)
+
+
+HYDROPHOBICITY = {
+    'A': 1.8, 'C': 2.5, 'D': -3.5, 'E': -3.5, 'F': 2.8,
+    'G': -0.4, 'H': -3.2, 'I': 4.5, 'K': -3.9, 'L': 3.8,
+    'M': 1.9, 'N': -3.5, 'P': -1.6, 'Q': -3.5, 'R': -4.5,
+    'S': -0.8, 'T': -0.7, 'V': 4.2, 'W': -0.9, 'Y': -1.3
+}
+
+PROTEIN_COLUMNS = ['p_' + col for col in WINDOW_COLUMNS[2:]]
+
+
+def unscorable_residues(sequence):
+    """Letters of ``sequence`` outside AMINO_ACIDS (in either case), sorted; empty if it can be scored."""
+    return sorted(set(sequence.upper()).difference(AMINO_ACIDS))
+
+
+def check_sequence(sequence):
+    """Raises ValueError unless ``sequence`` is non-empty and made of the 20 standard amino acids.
+
+    A single other letter makes every ``p_*`` feature NaN, which the tree models reject for every window.
+    """
+    if not sequence:
+        raise ValueError("empty sequence")
+    invalid = unscorable_residues(sequence)
+    if invalid:
+        raise ValueError(f"non-standard residues {''.join(invalid)} in the sequence; "
+                         f"only {''.join(AMINO_ACIDS)} can be scored")
+
+
+def protein_features(sequence):
+    """Whole-protein (``p_*``) features as a single record, computed once per sequence.
+
+    Raises ValueError for sequences ``check_sequence`` rejects.
+    """
+    check_sequence(sequence)
+    matrix = window_feature_matrix(encode(sequence), [0], len(sequence))
+    record = {'p_Sequence': sequence}
+    record.update(zip(PROTEIN_COLUMNS, matrix[0, 2:].tolist()))
+    return record
+
+
+def hydrophobicity(sequence):
+    values = [HYDROPHOBICITY.get(aa, 0.5) for aa in sequence.upper()]
+    return sum(values) / len(values) if len(values) > 0 else 0.5
@@ -0,0 +1,143 @@
+"""Process-wide model registry.
+
+Each pickle is unpickled once per process, on first use or through
+``preload``, and the loaded estimator is shared by every Streamlit rerun and
+session (the module stays in ``sys.modules`` across reruns). A pickle that is
+replaced on disk is loaded again on its next use.
+"""
+import os
+import resource
+import threading
+import time
+
+import joblib
+import numpy as np
+
+from reference import file_sha256
+from schema import MODEL_SCHEMAS, SCHEMAS
+from tracing import span
+from trees import compile_model
+
+MODEL_FILES = {
+    'bagging': 'Bagging_tar_mhc1.pkl',
+    'extratree': 'extratree_tar_mhc1.pkl',
+    'randomforest': 'randomforest_tar_mhc1.pkl',
+    'xgb_score': 'xgb_score_mhc1.pkl',
+    'lgb_score': 'lgb_score_mhc1.pkl',
+    'extra_tree_hla': 'extra_tree_hla_mhc1.pkl',
+    'xgbr_hla': 'xgbr_hla_mhc1.pkl',
+    'hist_hla': 'hist_hla_mhc1.pkl',
+}
+
+PREDICT_CHUNK_SIZE = int(os.environ.get('PREDICT_CHUNK_SIZE', 8192))
+# Set to 0 to predict with the unpickled estimators instead of their compiled form (trees.py).
+COMPILE_TREES = os.environ.get('CANCERPROVAX_COMPILE_TREES', '1') != '0'
+# Models predicted through trees.CompiledForest: those whose pickle is in the tree and that
+# 'python trees.py --sizes 1 8192 --repeats 10' shows at least trees.MIN_SPEEDUP faster on 1 and on 8192 rows,
+# run after run (bagging 2.0-2.3x, randomforest 1.20-1.26x). A model is added only after its report shows the same.
+COMPILED_MODELS = ['bagging', 'randomforest']
+
+_models = {}
+_stats = {}
+_reported_missing = set()
+_digests = {}
+_lock = threading.Lock()
+
+
+def _rss_bytes():
+    try:
+        with open('/proc/self/statm') as handle:
+            return int(handle.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError):
+        # ru_maxrss is a high-water mark in KiB; deltas are a lower bound.
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def model_path(name, model_dir='.'):
+    return os.path.join(model_dir, MODEL_FILES[name])
+
+
+def _fingerprint(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+def model_versions(names=None, model_dir='.'):
+    """sha256 of each model file; a file is only re-hashed when its size or mtime changes."""
+    versions = {}
+    for name in names or MODEL_FILES:
+        path = model_path(name, model_dir)
+        fingerprint = _fingerprint(path)
+        cached = _digests.get(path)
+        if cached is None or cached[0] != fingerprint:
+            cached = (fingerprint, file_sha256(path) if fingerprint else None)
+            _digests[path] = cached
+        versions[name] = cached[1]
+    return versions
+
+
+def missing_models(names=None, model_dir='.'):
+    missing = [name for name in (names or MODEL_FILES) if not os.path.exists(model_path(name, model_dir))]
+    with _lock:
+        for name in missing:
+            if name not in _reported_missing:
+                _reported_missing.add(name)
+                print(f"Model file {model_path(name, model_dir)} is missing")
+    return missing
+
+
+def get_model(name, model_dir='.'):
+    # A pickle replaced on disk is picked up on the next call; a deleted one keeps the loaded model.
+    path = model_path(name, model_dir)
+    fingerprint = _fingerprint(path)
+    model = _models.get(name)
+    if model is not None and fingerprint in (None, _stats[name]['fingerprint']):
+        return model
+    with _lock:
+        if name not in _models or fingerprint not in (None, _stats[name]['fingerprint']):
+            rss_before = _rss_bytes()
+            started = time.perf_counter()
+            with span('load_model', model=name, file=path):
+                loaded = joblib.load(path)
+            if name in MODEL_SCHEMAS:
+                SCHEMAS[MODEL_SCHEMAS[name]].check(loaded, path)
+            with span('compile_model', model=name, enabled=COMPILE_TREES):
+                model = compile_model(loaded) if COMPILE_TREES and name in COMPILED_MODELS else loaded
+            _stats[name] = {
+                'model': name,
+                'file': path,
+                'load_seconds': time.perf_counter() - started,
+                'rss_bytes': _rss_bytes() - rss_before,
+                'compiled': model is not loaded,
+                'fingerprint': fingerprint,
+            }
+            _models[name] = model
+            print(f"Loaded {path} in {_stats[name]['load_seconds']:.3f}s, "
+                  f"+{_stats[name]['rss_bytes'] / 2 ** 20:.1f} MiB resident")
+        return _models[name]
+
+
+def preload(names=None, model_dir='.'):
+    names = [name for name in (names or MODEL_FILES) if name not in missing_models([name], model_dir)]
+    for name in names:
+        get_model(name, model_dir)
+    return names
+
+
+def load_report():
+    with _lock:
+        return [{key: value for key, value in _stats[name].items() if key != 'fingerprint'}
+                for name in MODEL_FILES if name in _stats]
+
+
+def predict_batched(model, X, chunk_size=None):
+    """One ``predict`` per chunk of rows instead of one per window."""
+    chunk_size = chunk_size or PREDICT_CHUNK_SIZE
+    if len(X) == 0:
+        return np.empty(0)
+    if len(X) <= chunk_size:
+        return np.asarray(model.predict(X))
+    return np.concatenate([np.asarray(model.predict(X[i:i + chunk_size])) for i in range(0, len(X), chunk_size)])
@@ -0,0 +1,218 @@
+"""Per-peptide window feature store shared across proteins and requests.
+
+Window features (everything but ``start``/``end``) depend only on the
+peptide, so a peptide seen once never has to be computed again; each is kept
+as its packed ``features.window_stats`` record. Lookups go
+through a bounded in-process LRU, then a Bloom filter over the peptides in
+the sqlite store (a definite miss skips the disk), then sqlite; whatever is
+left is computed in one vectorized pass and written back to both tiers::
+
+    CANCERPROVAX_PEPTIDE_DB=peptides.sqlite streamlit run app.py
+    python batch.py proteins.fasta --peptide-db peptides.sqlite
+"""
+import collections
+import os
+import sqlite3
+import threading
+import time
+
+import numpy as np
+
+from features import AMINO_ACIDS, encode, stats_dtype, window_stats
+
+PEPTIDE_DB = os.environ.get('CANCERPROVAX_PEPTIDE_DB')
+MEMORY_ENTRIES = int(os.environ.get('CANCERPROVAX_PEPTIDE_MEMORY_ENTRIES', 1_000_000))
+FEATURES_VERSION = 2
+SQL_BATCH = 500
+# Seconds a connection waits for another process's write lock (batch.py --workers share one file), and how
+# many times a write that still finds the database locked is retried.
+SQLITE_TIMEOUT = 60.0
+LOCKED_RETRIES = 5
+CALIBRATION_WINDOWS = 20000
+
+_default = None
+_default_lock = threading.Lock()
+
+
+class BloomFilter:
+
+    def __init__(self, bits=1 << 24, hashes=4):
+        self.bits = bits
+        self.hashes = hashes
+        self._array = np.zeros(bits // 8 + 1, dtype=np.uint8)
+
+    def _positions(self, keys):
+        # Double hashing on Python's string hash; the filter is rebuilt from sqlite in every process.
+        hashed = np.fromiter((hash(key) for key in keys), dtype=np.int64, count=len(keys)).view(np.uint64)
+        first = hashed & np.uint64(0xFFFFFFFF)
+        second = (hashed >> np.uint64(32)) | np.uint64(1)
+        return (first[:, None] + second[:, None] * np.arange(self.hashes, dtype=np.uint64)) % np.uint64(self.bits)
+
+    def add(self, keys):
+        if keys:
+            positions = self._positions(keys).ravel()
+            np.bitwise_or.at(self._array, positions >> np.uint64(3),
+                             (np.uint8(1) << (positions & np.uint64(7)).astype(np.uint8)))
+
+    def might_contain(self, keys):
+        if not keys:
+            return np.zeros(0, dtype=bool)
+        positions = self._positions(keys)
+        bits = (self._array[positions >> np.uint64(3)] >> (positions & np.uint64(7)).astype(np.uint8)) & 1
+        return bits.all(axis=1)
+
+
+class PeptideStore:
+
+    def __init__(self, path=None, memory_entries=MEMORY_ENTRIES, bloom_bits=1 << 24):
+        self.path = path
+        self.memory_entries = memory_entries
+        self.counters = {'windows': 0, 'memory_hits': 0, 'disk_hits': 0, 'bloom_skips': 0,
+                         'bloom_false_positives': 0, 'computed': 0}
+        self.seconds = {'lookup': 0.0, 'compute': 0.0, 'store': 0.0}
+        self.estimated_direct_seconds = 0.0
+        self._memory = collections.OrderedDict()
+        self._bloom = BloomFilter(bloom_bits)
+        self._lock = threading.Lock()
+        self._db = None
+        self._seconds_per_window = {}
+        if path:
+            self._db = sqlite3.connect(path, timeout=SQLITE_TIMEOUT, check_same_thread=False)
+            self._write(self._create)
+            cursor = self._db.execute("SELECT peptide FROM peptides")
+            while True:
+                rows = cursor.fetchmany(100000)
+                if not rows:
+                    break
+                self._bloom.add([row[0] for row in rows])
+
+    def _create(self):
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        self._db.execute("CREATE TABLE IF NOT EXISTS peptides (peptide TEXT PRIMARY KEY, features BLOB)")
+        version = self._db.execute("SELECT value FROM meta WHERE key = 'features'").fetchone()
+        if version is None or version[0] != str(FEATURES_VERSION):
+            self._db.execute("DELETE FROM peptides")
+            self._db.execute("INSERT OR REPLACE INTO meta VALUES ('features', ?)", (str(FEATURES_VERSION),))
+
+    def _write(self, write):
+        # Runs ``write`` and commits; if another writer still holds the file after the busy timeout, the
+        # transaction is rolled back and retried with backoff rather than failing the run.
+        for attempt in range(LOCKED_RETRIES + 1):
+            try:
+                write()
+                self._db.commit()
+                return
+            except sqlite3.OperationalError as error:
+                self._db.rollback()
+                if 'locked' not in str(error) or attempt == LOCKED_RETRIES:
+                    raise
+                time.sleep(0.05 * 2 ** attempt)
+
+    def _remember(self, peptide, row):
+        self._memory[peptide] = row
+        if len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _from_disk(self, peptides):
+        found = {}
+        for i in range(0, len(peptides), SQL_BATCH):
+            chunk = peptides[i:i + SQL_BATCH]
+            query = f"SELECT peptide, features FROM peptides WHERE peptide IN ({','.join('?' * len(chunk))})"
+            for peptide, blob in self._db.execute(query, chunk):
+                found[peptide] = blob
+        return found
+
+    def features(self, peptides, window_size):
+        """``window_stats`` records for equal-length peptides, computing only the unseen ones."""
+        started = time.perf_counter()
+        keys = [peptide.upper() for peptide in peptides]
+        unique = list(dict.fromkeys(keys))
+        rows = {}
+        with self._lock:
+            missing = []
+            for key in unique:
+                row = self._memory.get(key)
+                if row is None:
+                    missing.append(key)
+                else:
+                    self._memory.move_to_end(key)
+                    rows[key] = row
+            self.counters['memory_hits'] += len(rows)
+            if missing and self._db is not None:
+                maybe = self._bloom.might_contain(missing)
+                candidates = [key for key, hit in zip(missing, maybe) if hit]
+                self.counters['bloom_skips'] += len(missing) - len(candidates)
+                found = self._from_disk(candidates)
+                self.counters['disk_hits'] += len(found)
+                self.counters['bloom_false_positives'] += len(candidates) - len(found)
+                for key, row in found.items():
+                    rows[key] = row
+                    self._remember(key, row)
+                missing = [key for key in missing if key not in found]
+        self.seconds['lookup'] += time.perf_counter() - started
+
+        if missing:
+            started = time.perf_counter()
+            # Missing peptides are laid end to end and scored in one pass; windows never straddle two.
+            codes = encode(''.join(missing))
+            computed = window_stats(codes, np.arange(len(missing)) * window_size, window_size)
+            blobs = [record.tobytes() for record in computed]
+            self.seconds['compute'] += time.perf_counter() - started
+            started = time.perf_counter()
+            with self._lock:
+                for key, blob in zip(missing, blobs):
+                    rows[key] = blob
+                    self._remember(key, blob)
+                if self._db is not None:
+                    values = list(zip(missing, blobs))
+                    self._write(lambda: self._db.executemany("INSERT OR REPLACE INTO peptides VALUES (?, ?)", values))
+                    self._bloom.add(missing)
+                self.counters['computed'] += len(missing)
+            self.seconds['store'] += time.perf_counter() - started
+
+        per_window = self._seconds_per_window.get(window_size) or self._calibrate(window_size)
+        with self._lock:
+            self.counters['windows'] += len(keys)
+            self.estimated_direct_seconds += len(keys) * per_window
+        started = time.perf_counter()
+        out = np.frombuffer(b''.join(rows[key] for key in keys), dtype=stats_dtype(window_size))
+        with self._lock:
+            self.seconds['lookup'] += time.perf_counter() - started
+        return out
+
+    def window_stats(self, sequence, window_size):
+        """Same records as ``features.window_stats`` over every window of ``sequence``."""
+        starts = range(max(len(sequence) - window_size + 1, 0))
+        return self.features([sequence[s:s + window_size] for s in starts], window_size)
+
+    def _calibrate(self, window_size):
+        # Estimated cost per window of computing every window directly, timed once per window length on a
+        # random sequence. Timed outside the lock so other callers are not held up; the first value published wins.
+        rng = np.random.default_rng(0)
+        codes = rng.integers(0, len(AMINO_ACIDS), CALIBRATION_WINDOWS + window_size - 1).astype(np.int8)
+        started = time.perf_counter()
+        window_stats(codes, np.arange(CALIBRATION_WINDOWS), window_size)
+        seconds = (time.perf_counter() - started) / CALIBRATION_WINDOWS
+        with self._lock:
+            return self._seconds_per_window.setdefault(window_size, seconds)
+
+    def report(self):
+        """Counters, measured feature time, and an estimate of computing every window directly instead."""
+        with self._lock:
+            return dict(self.counters, **{f'{name}_seconds': value for name, value in self.seconds.items()},
+                        memory_entries=len(self._memory),
+                        feature_seconds=sum(self.seconds.values()),
+                        estimated_direct_seconds=self.estimated_direct_seconds)
+
+
+def default_store():
+    """The process-wide store when CANCERPROVAX_PEPTIDE_DB is set, else None."""
+    global _default
+    if not PEPTIDE_DB:
+        return None
+    with _default_lock:
+        if _default is None:
+            _default = PeptideStore(PEPTIDE_DB)
+        return _default
@@ -0,0 +1,387 @@
+"""In-memory prediction pipeline.
+
+The stages pass typed DataFrames and arrays to each other; nothing is written
+to the working directory during a prediction. ``export`` writes the same CSVs
+the app used to produce, as an optional last step.
+"""
+import contextlib
+import functools
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from features import hydrophobicity, protein_features, window_features
+from models import get_model, predict_batched
+from reference import nearest_hla
+from schema import SCHEMAS
+from tracing import span, submit
+
+# Windows listed when more than RANK_LIMIT are predicted targets, and the column that orders them.
+RANK_LIMIT = int(os.environ.get('CANCERPROVAX_RANK_LIMIT', 30))
+RANK_COLUMN = os.environ.get('CANCERPROVAX_RANK_COLUMN', 'XGB_predicted_score')
+# Set to 1 to run the HLA stages only on the windows the ranking can list (see ``cascade_rows``).
+CASCADE = os.environ.get('CANCERPROVAX_CASCADE', '0') == '1'
+# Threads that run a request's independent model predictions side by side; 1 runs them one after another.
+MODEL_THREADS = int(os.environ.get('CANCERPROVAX_MODEL_THREADS', 0)) or min(os.cpu_count() or 1, 5)
+
+_timings_lock = threading.Lock()
+_model_pool = None
+_model_pool_lock = threading.Lock()
+
+# prediction option -> MHC classes it runs
+MODES = {'MHC-1': ['MHC-1'], 'MHC-2': ['MHC-2'], 'BOTH': ['MHC-1', 'MHC-2']}
+
+# Window length per MHC class. Both classes currently run the MHC-I models on 10-mers.
+MHC_CLASSES = {
+    'MHC-1': {'window_size': 10},
+    'MHC-2': {'window_size': 10},
+}
+
+# result table -> file name used by the original app
+EXPORT_FILES = {
+    'epitopes': 'epitopes_results.csv',
+    'protein': 'p_Sequence.csv',
+    'extracted': 'extracted_columns.csv',
+    'kolaskar': 'kolaskar.csv',
+    'scores': 'final_output.csv',
+    'final': 'expected.csv',
+    'targets': 'target.csv',
+}
+
+# per-window columns of the machine-readable result
+RECORD_COLUMNS = ['start', 'end', 'Epitope', 'XGB_predicted_score', 'light_gbm_predicted_score',
+                  'Extra_tree_Target', 'bagging_Target', 'Random_forest_Target',
+                  'lgbm_prediction', 'extra_hla', 'hist_hla', 'Target', 'hla_values']
+
+
+def features(sequence, window_size=10):
+    return protein_features(sequence), window_features(sequence, window_size=window_size)
+
+
+@contextlib.contextmanager
+def _stage(timings, stage, **attributes):
+    # A tracing span, whose wall time is also added to ``timings`` when the caller asked for them.
+    started = time.perf_counter()
+    try:
+        with span(stage, **attributes):
+            yield
+    finally:
+        if timings is not None:
+            elapsed = time.perf_counter() - started
+            with _timings_lock:
+                timings[stage] = timings.get(stage, 0.0) + elapsed
+
+
+def _split(values, offsets):
+    return [values[a:b] for a, b in zip(offsets[:-1], offsets[1:])]
+
+
+def set_model_threads(count):
+    """Sets ``MODEL_THREADS`` for the requests that follow, e.g. to 1 in a worker process."""
+    global MODEL_THREADS
+    MODEL_THREADS = count
+
+
+def _model_executor():
+    # One pool for the whole process, so concurrent requests share MODEL_THREADS threads between them.
+    global _model_pool
+    with _model_pool_lock:
+        if MODEL_THREADS <= 1:
+            return None
+        if _model_pool is None or _model_pool[0] != MODEL_THREADS:
+            if _model_pool is not None:
+                _model_pool[1].shutdown(wait=False)
+            _model_pool = (MODEL_THREADS, ThreadPoolExecutor(max_workers=MODEL_THREADS, thread_name_prefix='model'))
+        return _model_pool[1]
+
+
+def _predict_model(name, stacked, jobs):
+    model = get_model(name)
+    with span('predict', model=name, batch_size=len(stacked), jobs=jobs):
+        return predict_batched(model, stacked)
+
+
+def _stacked(matrices):
+    return np.cumsum([0] + [len(matrix) for matrix in matrices]), np.vstack(matrices)
+
+
+def _start_predictions(names, inputs):
+    """Starts one predict call per model over the rows of all matrices ``inputs()`` returns.
+
+    Returns a callable that waits for them and returns the predictions split back per matrix. The models
+    run on the shared model threads; with one thread, nothing is built or run until that call.
+    """
+    executor = _model_executor()
+    if executor is None:
+        return functools.partial(_predict_stacked, names, inputs)
+    offsets, stacked = _stacked(inputs())
+    futures = {name: submit(executor, _predict_model, name, stacked, len(offsets) - 1) for name in names}
+    return lambda: {name: _split(future.result(), offsets) for name, future in futures.items()}
+
+
+def _predict_stacked(names, inputs):
+    """One predict call per model, in turn, over the rows of all matrices ``inputs()`` returns."""
+    offsets, stacked = _stacked(inputs())
+    return {name: _split(_predict_model(name, stacked, len(offsets) - 1), offsets) for name in names}
+
+
+def target_predictions(dense, proteins):
+    schema = SCHEMAS['target']
+    extracted = [pd.DataFrame(schema.matrix(matrix, protein), columns=schema.inputs)
+                 for matrix, protein in zip(dense, proteins)]
+    predictions = _start_predictions(['bagging', 'extratree', 'randomforest'],
+                                     lambda: [frame.to_numpy() for frame in extracted])()
+    return extracted, [{name: values[i] for name, values in predictions.items()} for i in range(len(extracted))]
+
+
+def start_score_predictions(dense, proteins):
+    """Starts the Kolaskar score models, which do not depend on the targets, for ``kolaskar_scores``."""
+    return _start_predictions(['xgb_score', 'lgb_score'],
+                              lambda: [SCHEMAS['score'].matrix(matrix, protein)
+                                       for matrix, protein in zip(dense, proteins)])
+
+
+def kolaskar_scores(windows, targets, started):
+    predictions = started()
+    return [pd.DataFrame({
+        "start": frame.start,
+        "end": frame.end,
+        "Epitope": frame.epitopes,
+        "XGB_predicted_score": predictions['xgb_score'][i],
+        "light_gbm_predicted_score": predictions['lgb_score'][i],
+        "Extra_tree_Target": targets[i]['extratree'],
+        "bagging_Target": targets[i]['bagging'],
+        "Random_forest_Target": targets[i]['randomforest'],
+    }) for i, frame in enumerate(windows)]
+
+
+def hla_predictions(dense, proteins, sequences, kolaskar, rows=None):
+    """HLA regressor outputs per window; with ``rows``, only those windows of each job are scored, the rest NaN."""
+    rows = rows or [None] * len(dense)
+    matrices = []
+    for matrix, protein, sequence, kolaskar_frame, kept in zip(dense, proteins, sequences, kolaskar, rows):
+        target = kolaskar_frame['Extra_tree_Target'].values
+        if kept is not None:
+            matrix, target = matrix[kept], target[kept]
+        constants = dict(protein, Target=target, type=0, hydrophobicity=hydrophobicity(sequence))
+        matrices.append(SCHEMAS['hla'].matrix(matrix, constants))
+    predictions = _start_predictions(['xgbr_hla', 'extra_tree_hla', 'hist_hla'], lambda: matrices)()
+    scores = []
+    for i, kolaskar_frame in enumerate(kolaskar):
+        frame = kolaskar_frame.copy()
+        for column, name in [('lgbm_prediction', 'xgbr_hla'), ('extra_hla', 'extra_tree_hla'),
+                             ('hist_hla', 'hist_hla')]:
+            frame[column] = _scatter(predictions[name][i], rows[i], len(frame))
+        scores.append(frame)
+    return scores
+
+
+def _scatter(values, rows, size):
+    if rows is None:
+        return values
+    full = np.full(size, np.nan, dtype=np.result_type(values.dtype, np.float32))
+    full[rows] = values
+    return full
+
+
+def top_positions(scores, limit):
+    """Positions of the ``limit`` highest scores, highest first and earlier positions first among ties.
+
+    A partial selection finds the ``limit``-th highest score; only the scores at or above it are sorted.
+    NaN scores rank last.
+    """
+    order = -np.asarray(scores, dtype=np.float64)
+    if limit <= 0:
+        return np.empty(0, np.intp)
+    if limit < len(order):
+        kth = np.partition(order, limit - 1)[limit - 1]
+        if not np.isnan(kth):
+            candidates = np.flatnonzero(order <= kth)
+            return candidates[np.argsort(order[candidates], kind='stable')][:limit]
+    return np.argsort(order, kind='stable')[:limit]
+
+
+def _ranking_targets(frame):
+    return (frame[['Extra_tree_Target', 'Random_forest_Target']].sum(axis=1) > 1).astype(int)
+
+
+def ranking_rows(frame, limit=RANK_LIMIT, column=RANK_COLUMN):
+    """Returns (positions, targets_only): the rows of ``frame`` that ``rank`` lists, in its order."""
+    targets = np.flatnonzero(_ranking_targets(frame).values == 1)
+    if len(targets) <= limit:
+        return targets, True
+    return top_positions(frame[column].values, limit), False
+
+
+def cascade_rows(kolaskar_frame, limit=RANK_LIMIT, column=RANK_COLUMN):
+    """Windows that can reach the ranking, known before the HLA stages; None if that needs their output.
+
+    The ranking only lists predicted targets, or the top ``limit`` by ``column``, and both come from
+    the target and score models.
+    """
+    targets = np.flatnonzero(_ranking_targets(kolaskar_frame).values == 1)
+    if len(targets) <= limit:
+        return targets
+    if column not in kolaskar_frame:
+        return None
+    return np.sort(top_positions(kolaskar_frame[column].values, limit))
+
+
+def rank(final, limit=RANK_LIMIT, column=RANK_COLUMN):
+    """Returns (table, targets_only): the predicted targets if there are at most ``limit``, else the
+    ``limit`` windows with the highest ``column``, one row each."""
+    ranked = final.copy()
+    ranked['Target'] = _ranking_targets(ranked)
+    positions, targets_only = ranking_rows(ranked, limit, column)
+    top = ranked.iloc[positions].reset_index(drop=True)
+    if targets_only:
+        return top, True
+    df = pd.DataFrame({'Epitope': top['Epitope'].values, 'HLA': top['hla_values'].values,
+                       'Start': top['start'].values, 'End': top['end'].values})
+    return df, False
+
+
+def predict_heads_many(reference, jobs, timings=None, cascade=CASCADE):
+    """Model stages for several ``(sequence, protein, windows)`` jobs with one predict call per model.
+
+    If ``timings`` is a dict, the seconds spent in each stage are added to it. With ``cascade``, the HLA
+    regressors and the nearest-HLA search run only on the windows the ranking can list; the others get
+    NaN HLA predictions and no HLA values, the ranking is unchanged, and each result's ``cascade`` entry
+    reports the windows pruned and the seconds the HLA stages took (``bench.py --cascade`` measures the
+    time saved).
+    """
+    sequences, proteins, windows = (list(column) for column in zip(*jobs))
+    count = sum(len(frame) for frame in windows)
+    # The float64 window features exist only while the models run; results keep the compact form.
+    with _stage(timings, 'features', windows=count):
+        dense = [frame.matrix() for frame in windows]
+    with _stage(timings, 'targets', windows=count, jobs=len(jobs)):
+        # With several model threads the score models run alongside the target classifiers.
+        scores_started = start_score_predictions(dense, proteins)
+        extracted, targets = target_predictions(dense, proteins)
+    with _stage(timings, 'kolaskar', windows=count, jobs=len(jobs)):
+        kolaskar = kolaskar_scores(windows, targets, scores_started)
+    rows = [cascade_rows(frame) for frame in kolaskar] if cascade else [None] * len(jobs)
+    scored = sum(len(frame) if kept is None else len(kept) for frame, kept in zip(kolaskar, rows))
+    started = time.perf_counter()
+    with _stage(timings, 'hla', windows=scored, jobs=len(jobs), pruned=count - scored):
+        scores = hla_predictions(dense, proteins, sequences, kolaskar, rows)
+    del dense, scores_started
+    with _stage(timings, 'nearest_hla', windows=scored):
+        values = [frame['extra_hla'].values if kept is None else frame['extra_hla'].values[kept]
+                  for frame, kept in zip(scores, rows)]
+        offsets = np.cumsum([0] + [len(value) for value in values])
+        nearest = _split(nearest_hla(reference['hla_index'], np.concatenate(values)), offsets)
+        for i, kept in enumerate(rows):
+            if kept is not None:
+                full = [[] for _ in range(len(scores[i]))]
+                for position, hla in zip(kept, nearest[i]):
+                    full[position] = hla
+                nearest[i] = full
+    hla_seconds = time.perf_counter() - started
+
+    results = []
+    for i, frame in enumerate(scores):
+        final = frame.copy()
+        count_ones = final[['Extra_tree_Target', 'Random_forest_Target', 'bagging_Target']].sum(axis=1)
+        final['Target'] = (count_ones > 2).astype(int)
+        final['hla_values'] = nearest[i]
+        with _stage(timings, 'ranking', windows=len(final)):
+            ranking, targets_only = rank(final)
+        results.append({
+            'epitopes': windows[i],
+            'protein': pd.DataFrame([proteins[i]]),
+            'extracted': extracted[i],
+            'kolaskar': kolaskar[i],
+            'scores': frame,
+            'final': final,
+            'ranking': ranking,
+            'targets_only': targets_only,
+        })
+        if cascade:
+            pruned = 0 if rows[i] is None else len(frame) - len(rows[i])
+            results[-1]['cascade'] = {'windows': len(frame), 'pruned': pruned, 'hla_seconds': hla_seconds}
+    return results
+
+
+def predict_heads(sequence, reference, protein, windows):
+    """Model stages for one class, given the shared protein record and window frame."""
+    return predict_heads_many(reference, [(sequence, protein, windows)])[0]
+
+
+def predict(sequence, reference, window_size=10):
+    protein, windows = features(sequence, window_size)
+    return predict_heads(sequence, reference, protein, windows)
+
+
+def class_jobs(sequence, classes, store=None, timings=None):
+    """One ``(sequence, protein, windows)`` job per distinct class configuration, from one feature pass.
+
+    Returns ``(configs, jobs)``: the configuration key of each class and the job for each key. Protein
+    features are computed once and window features once per distinct window length.
+    """
+    configs = {mhc_class: tuple(sorted(MHC_CLASSES[mhc_class].items())) for mhc_class in classes}
+    with _stage(timings, 'features', residues=len(sequence)):
+        with span('protein_features'):
+            protein = protein_features(sequence)
+        windows = {}
+        for size in sorted({MHC_CLASSES[mhc_class]['window_size'] for mhc_class in classes}):
+            with span('window_features', window_size=size, store=store is not None):
+                windows[size] = window_features(sequence, window_size=size, store=store)
+    jobs = {config: (sequence, protein, windows[dict(config)['window_size']])
+            for config in dict.fromkeys(configs.values())}
+    return configs, jobs
+
+
+def predict_classes(sequence, reference, classes, store=None, timings=None, cascade=CASCADE):
+    """Results per MHC class; classes with the same configuration share one head run, the rest run concurrently.
+
+    Stage times added to ``timings`` are summed over the head runs, so concurrent runs can exceed the wall time.
+    """
+    configs, jobs = class_jobs(sequence, classes, store, timings)
+    with ThreadPoolExecutor(max_workers=max(len(jobs), 1)) as pool:
+        futures = {config: submit(pool, predict_heads_many, reference, [job], timings, cascade)
+                   for config, job in jobs.items()}
+        return {mhc_class: futures[configs[mhc_class]].result()[0] for mhc_class in classes}
+
+
+def _json_records(frame):
+    # Missing values (pruned HLA columns under the cascade) become None, i.e. JSON null rather than bare NaN.
+    return frame.astype(object).where(frame.notna(), None).to_dict('records')
+
+
+def protein_record(record_id, sequence, results):
+    """JSON-ready summary of ``predict_classes`` output for one protein."""
+    classes = {}
+    for mhc_class, result in results.items():
+        classes[mhc_class] = {
+            'window_size': MHC_CLASSES[mhc_class]['window_size'],
+            'epitopes': _json_records(result['final'][RECORD_COLUMNS]),
+            'targets_only': result['targets_only'],
+            'ranking': _json_records(result['ranking']),
+        }
+        if 'cascade' in result:
+            classes[mhc_class]['cascade'] = result['cascade']
+    return {'id': record_id, 'length': len(sequence), 'classes': classes}
+
+
+def json_default(value):
+    return value.item() if hasattr(value, 'item') else value
+
+
+def export(result, out_dir='.'):
+    os.makedirs(out_dir, exist_ok=True)
+    tables = dict(result, epitopes=result['epitopes'].frame())
+    if result['targets_only']:
+        tables['targets'] = result['ranking']
+    paths = []
+    for name, file_name in EXPORT_FILES.items():
+        if name in tables:
+            path = os.path.join(out_dir, file_name)
+            tables[name].to_csv(path, index=False)
+            paths.append(path)
+    return paths
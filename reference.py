@@ -0,0 +1,213 @@
+"""Offline build of the cleaned output3.0.csv reference set.
+
+The app used to clean output3.0.csv three times per click. The same cleaning
+now runs once here and is written to a pruned, typed artifact with a content
+hash; the app loads it once per process::
+
+    python reference.py [output3.0.csv] [reference_mhc1.pkl]
+"""
+import functools
+import hashlib
+import os
+import sys
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from features import hydrophobicity
+from schema import HLA_COLUMNS, SCORE_COLUMNS, TARGET_COLUMNS
+from tracing import span
+
+SOURCE_PATH = 'output3.0.csv'
+REFERENCE_PATH = 'reference_mhc1.pkl'
+FORMAT_VERSION = 1
+NEAREST_HLA = 10
+
+AMINO_ACID_VALUES = {
+    'A': 1.8, 'C': 2.5, 'D': -3.5, 'E': -3.5, 'F': 2.8,
+    'G': -0.4, 'H': -3.2, 'I': 4.5, 'K': -3.9, 'L': 3.8,
+    'M': 1.9, 'N': -3.5, 'P': -1.6, 'Q': -3.5, 'R': -4.5,
+    'S': -0.8, 'T': -0.7, 'V': 4.2, 'W': -0.9, 'Y': -1.3
+}
+
+
+def hla_training_score(hla):
+    # Additive variant the HLA regressors were trained against.
+    alleles = str(hla).split('/')
+    total_score = 0
+    for allele in alleles:
+        amino_acid_sequence = ''.join(char for char in allele if char.isalpha())
+        numeric_multiplier = ''.join(char for char in allele if char.isdigit())
+        for amino_acid in amino_acid_sequence:
+            if numeric_multiplier:
+                total_score += abs(AMINO_ACID_VALUES.get(amino_acid, 0)) + float(numeric_multiplier)
+    return total_score
+
+
+def hla_lookup_score(hla):
+    # Multiplicative variant the app compares the extra-trees HLA prediction against.
+    alleles = str(hla).split('/')
+    total_score = 0
+    for allele in alleles:
+        amino_acid_sequence = ''.join(char for char in allele if char.isalpha())
+        numeric_multiplier = ''.join(char for char in allele if char.isdigit())
+        for amino_acid in amino_acid_sequence:
+            if numeric_multiplier:
+                total_score += abs(AMINO_ACID_VALUES.get(amino_acid, 0)) * float(numeric_multiplier)
+    return total_score
+
+
+def build_hla_index(hla_strings, k=NEAREST_HLA):
+    """Distinct lookup scores in sorted order, each with the first ``k`` positions of the strings having it."""
+    hla_strings = np.asarray(hla_strings, dtype=object)
+    scores = np.array([hla_lookup_score(hla) for hla in hla_strings], dtype=np.float64)
+    values, inverse = np.unique(scores, return_inverse=True)
+    order = np.argsort(inverse, kind='stable')
+    group_start = np.searchsorted(inverse[order], np.arange(len(values)))
+    rank = np.arange(len(order)) - group_start[inverse[order]]
+    positions = np.full((len(values), k), len(hla_strings), dtype=np.int64)
+    keep = rank < k
+    positions[inverse[order][keep], rank[keep]] = order[keep]
+    return {'k': k, 'strings': hla_strings, 'scores': scores, 'values': values, 'positions': positions}
+
+
+def _nearest_exact(index, value):
+    order = sorted(range(len(index['scores'])), key=lambda i: abs(index['scores'][i] - value))
+    return order[:index['k']]
+
+
+def nearest_hla(index, values):
+    """The ``k`` strings closest in lookup score to each value, in the order a stable sort by distance gives.
+
+    Only the ``k`` distinct scores on either side of each value can contribute, so every value is resolved
+    from ``2k`` neighbours of its insertion point in the sorted scores.
+    """
+    k, values_sorted, positions = index['k'], index['values'], index['positions']
+    values = np.asarray(values, dtype=np.float64)
+    n, size = len(values_sorted), len(index['strings'])
+    if size == 0 or len(values) == 0:
+        return [[] for _ in values]
+    insert = np.searchsorted(values_sorted, values)
+    cols = insert[:, None] + np.arange(-k, k)
+    inside = (cols >= 0) & (cols < n)
+    cols = np.clip(cols, 0, n - 1)
+    distance = np.where(inside, np.abs(values_sorted[cols] - values[:, None]), np.inf)
+
+    candidate = positions[cols].reshape(len(values), -1)
+    candidate_distance = np.repeat(distance, k, axis=1)
+    candidate_distance[candidate == size] = np.inf
+    order = np.lexsort((candidate, candidate_distance), axis=-1)[:, :min(k, size)]
+    nearest = np.take_along_axis(candidate, order, axis=1)
+
+    # Distinct scores can still round to the same distance; if one just outside the window ties the
+    # k-th distance, settle that value with the full stable sort. So are NaN and +-inf, for which every
+    # distance is NaN or inf and the window says nothing.
+    kth = np.take_along_axis(candidate_distance, order[:, -1:], axis=1)[:, 0]
+    left, right = insert - k - 1, insert + k
+    tied = (left >= 0) & (np.abs(values_sorted[np.clip(left, 0, n - 1)] - values) <= kth)
+    tied |= (right < n) & (np.abs(values_sorted[np.clip(right, 0, n - 1)] - values) <= kth)
+    result = [list(index['strings'][row]) for row in nearest]
+    for i in np.flatnonzero(tied | ~np.isfinite(values)):
+        result[i] = list(index['strings'][_nearest_exact(index, values[i])])
+    return result
+
+
+def clean(data, thres):
+    # Offline only; keeps sklearn out of the app's import path.
+    from sklearn.preprocessing import LabelEncoder
+
+    data = data.copy()
+    for col in data.select_dtypes(include='number').columns:
+        if data[col].skew() > 0:
+            data[col] = data[col].fillna(data[col].mean())
+        elif data[col].skew() < 0:
+            data[col] = data[col].fillna(data[col].median())
+    x = []
+    for i in data.select_dtypes(include='number').columns.values:
+        z_scores = (data[i] - data[i].mean()) / data[i].std()
+        if (z_scores > 3).sum() > 0:
+            x.append(i)
+    for i in x:
+        upper = data[i].mean() + thres * data[i].std()
+        lower = data[i].mean() - thres * data[i].std()
+        data = data[(data[i] > lower) & (data[i] < upper)]
+    data = data.copy()
+    data['type'] = LabelEncoder().fit_transform(data['Type'])
+    return data
+
+
+def _typed(frame, columns):
+    return frame[columns].astype(np.float64).reset_index(drop=True)
+
+
+def build_reference(source=SOURCE_PATH):
+    data = pd.read_csv(source)
+
+    strict = clean(data, 2.5)
+    target = _typed(strict, TARGET_COLUMNS)
+    target['Target'] = strict['Target'].values
+    score = _typed(strict, SCORE_COLUMNS + ['Kolaskar.Tongaonkar.Score'])
+
+    loose = clean(data, 3)
+    loose['p_Sequence'] = loose['p_Sequence'].fillna('')
+    loose['hydrophobicity'] = loose['p_Sequence'].apply(hydrophobicity)
+    loose['hla'] = loose['HLA'].apply(hla_training_score)
+    hla = _typed(loose, HLA_COLUMNS + ['hla'])
+    hla['HLA'] = loose['HLA'].astype(str).values
+
+    return {'target': target, 'score': score, 'hla': hla}
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as handle:
+        for block in iter(lambda: handle.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def content_hash(tables):
+    digest = hashlib.sha256()
+    for name in sorted(tables):
+        table = tables[name]
+        digest.update(name.encode())
+        digest.update(repr([(col, str(dtype)) for col, dtype in table.dtypes.items()]).encode())
+        digest.update(pd.util.hash_pandas_object(table, index=False).values.tobytes())
+    return digest.hexdigest()
+
+
+def write_reference(source=SOURCE_PATH, path=REFERENCE_PATH):
+    tables = build_reference(source)
+    artifact = {
+        'format': FORMAT_VERSION,
+        'source_sha256': file_sha256(source),
+        'sha256': content_hash(tables),
+        'tables': tables,
+    }
+    joblib.dump(artifact, path)
+    return artifact
+
+
+@functools.lru_cache(maxsize=None)
+def load_reference(path=REFERENCE_PATH):
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"{path} not found; build it with 'python reference.py {SOURCE_PATH} {path}'")
+    with span('load_reference', file=path):
+        artifact = joblib.load(path)
+        if artifact.get('format') != FORMAT_VERSION:
+            raise ValueError(f"{path} has format {artifact.get('format')}, expected {FORMAT_VERSION}; rebuild it")
+        if content_hash(artifact['tables']) != artifact['sha256']:
+            raise ValueError(f"{path} does not match its content hash; rebuild it")
+        with span('build_hla_index', rows=len(artifact['tables']['hla'])):
+            artifact['hla_index'] = build_hla_index(artifact['tables']['hla']['HLA'].values)
+    return artifact
+
+
+if __name__ == "__main__":
+    source = sys.argv[1] if len(sys.argv) > 1 else SOURCE_PATH
+    path = sys.argv[2] if len(sys.argv) > 2 else REFERENCE_PATH
+    artifact = write_reference(source, path)
+    for name, table in artifact['tables'].items():
+        print(f"{name}: {len(table)} rows x {table.shape[1]} columns")
+    print(f"wrote {path} (sha256 {artifact['sha256']})")
@@ -0,0 +1,132 @@
+"""Feature schema of every model.
+
+The models were fitted on the reference table, whose columns use the
+training names (``p.`` prefix for whole-protein features, ``Hydrogen``,
+``TotalAtoms``, ...). Inference computes the same quantities under the
+``features`` names (``p_`` prefix, ``H_Count``, ``TotalAtoms_Count``, ...).
+Each schema declares its model inputs once, in training names and order;
+``inference_name`` maps them, and the schema resolves them to integer
+indices into the window feature matrix, so building a model input is one
+gather plus the per-request constants.
+"""
+import numpy as np
+
+from features import PROTEIN_COLUMNS, WINDOW_COLUMNS
+
+# training name -> inference name, after the 'p.' -> 'p_' prefix is handled
+RENAMES = {
+    'Hydrogen': 'H_Count', 'Carbon': 'C_Count', 'Nitrogen': 'N_Count', 'Oxygen': 'O_Count', 'Sulfer': 'S_Count',
+    'TotalAtoms': 'TotalAtoms_Count', 'Amphipathicity.Estimate': 'Amphipathicity',
+}
+
+TARGET_COLUMNS = ['start', 'end', 'R_Percent', 'D_Percent', 'Q_Percent', 'H_Percent',
+                  'I_Percent', 'L_Percent', 'K_Percent', 'S_Percent', 'Theoretical.pI',
+                  'Aliphatic.Index', 'Helix.Fraction', 'Charge.at.pH.7.0',
+                  'Amphipathicity', 'p.Molecular.Weight',
+                  'p.Instability.Index', 'p.Helix.Fraction', 'p.Amphipathicity.Estimate',
+                  'p.Aliphatic.Index', 'p.H_Count', 'p.C_Count', 'p.N_Count', 'p.O_Count',
+                  'p.S_Count', 'p.TotalAtoms_Count', 'p.A_Percent', 'p.D_Percent',
+                  'p.E_Percent', 'p.G_Percent', 'p.I_Percent', 'p.K_Percent',
+                  'p.F_Percent', 'p.T_Percent', 'p.V_Percent']
+
+SCORE_COLUMNS = ['start', 'end', 'A_Percent', 'R_Percent', 'N_Percent', 'D_Percent',
+                 'C_Percent', 'E_Percent', 'Q_Percent', 'G_Percent', 'H_Percent',
+                 'I_Percent', 'L_Percent', 'K_Percent', 'M_Percent', 'F_Percent',
+                 'P_Percent', 'S_Percent', 'T_Percent', 'W_Percent', 'Y_Percent',
+                 'V_Percent', 'Hydrogen', 'Carbon', 'Nitrogen', 'Sulfer', 'TotalAtoms',
+                 'Theoretical.pI', 'Aliphatic.Index', 'Positive.Residues',
+                 'Negative.Residues', 'Aromatic.Count', 'Polar.Count', 'Nonpolar.Count',
+                 'Molecular.Weight', 'Instability.Index', 'Aromaticity',
+                 'Helix.Fraction', 'Strand.Fraction', 'Coil.Fraction',
+                 'Charge.at.pH.7.0', 'Amphipathicity', 'GRAVY.Last.50',
+                 'p.Instability.Index', 'p.Helix.Fraction', 'p.Strand.Fraction',
+                 'p.Coil.Fraction', 'p.Charge.at.pH.7.0', 'p.Amphipathicity.Estimate',
+                 'p.Aliphatic.Index', 'p.Aromatic.Count', 'p.Nonpolar.Count',
+                 'p.H_Count', 'p.C_Count', 'p.O_Count', 'p.TotalAtoms_Count',
+                 'p.R_Percent', 'p.N_Percent', 'p.D_Percent', 'p.E_Percent',
+                 'p.L_Percent', 'p.T_Percent', 'p.W_Percent']
+
+HLA_COLUMNS = ['Target', 'C_Percent', 'Q_Percent', 'G_Percent', 'K_Percent',
+               'P_Percent', 'S_Percent', 'T_Percent',
+               'W_Percent', 'Hydrogen', 'Carbon', 'Nitrogen',
+               'Oxygen', 'TotalAtoms', 'Theoretical.pI', 'Positive.Residues',
+               'Negative.Residues', 'Aromatic.Count', 'Polar.Count', 'Nonpolar.Count',
+               'Molecular.Weight',
+               'Instability.Index', 'Strand.Fraction',
+               'Charge.at.pH.7.0', 'p.Aromaticity', 'p.Strand.Fraction',
+               'p.Coil.Fraction', 'p.Gravy', 'p.Amphipathicity.Estimate',
+               'p.GRAVY.Last.50',
+               'p.Aliphatic.Index', 'p.Polar.Count', 'p.N_Percent', 'p.C_Percent',
+               'p.K_Percent', 'p.F_Percent',
+               'p.P_Percent', 'p.S_Percent', 'p.T_Percent',
+               'p.W_Percent',
+               'p.V_Percent', 'type', 'hydrophobicity']
+
+# inputs that are neither window nor protein features, supplied per request by the pipeline
+REQUEST_INPUTS = ['Target', 'type', 'hydrophobicity']
+
+
+def inference_name(column):
+    if column.startswith('p.'):
+        name = column[2:]
+        return 'p_' + RENAMES.get(name, name)
+    return RENAMES.get(column, column)
+
+
+class Schema:
+
+    def __init__(self, name, columns):
+        self.name = name
+        self.columns = list(columns)
+        self.inputs = [inference_name(col) for col in self.columns]
+        window_index = {col: j for j, col in enumerate(WINDOW_COLUMNS)}
+        unknown = [col for col in self.inputs
+                   if col not in window_index and col not in PROTEIN_COLUMNS and col not in REQUEST_INPUTS]
+        if unknown:
+            raise ValueError(f"schema {name}: no feature computes {', '.join(unknown)}")
+        self.window_positions = np.array([j for j, col in enumerate(self.inputs) if col in window_index], np.intp)
+        self.window_columns = np.array([window_index[col] for col in self.inputs if col in window_index], np.intp)
+        self.constants = [(j, col) for j, col in enumerate(self.inputs) if col not in window_index]
+
+    def matrix(self, windows, constants):
+        """Model input from the float64 WINDOW_COLUMNS matrix ``windows`` and per-request ``constants``."""
+        out = np.empty((len(windows), len(self.inputs)))
+        out[:, self.window_positions] = windows[:, self.window_columns]
+        for j, col in self.constants:
+            out[:, j] = constants[col]
+        return out
+
+    def check(self, model, label):
+        """Raises ValueError if ``model`` was fitted on a different number, order or naming of features."""
+        fitted = getattr(model, 'n_features_in_', None)
+        if fitted is not None and fitted != len(self.columns):
+            raise ValueError(f"{label} expects {fitted} features, the {self.name} schema has {len(self.columns)}")
+        names = fitted_names(model)
+        if names is not None and [str(name) for name in names] != self.columns:
+            differ = next(j for j, (a, b) in enumerate(zip(names, self.columns)) if a != b)
+            raise ValueError(f"{label} feature {differ} is {names[differ]!r}, "
+                             f"the {self.name} schema has {self.columns[differ]!r}")
+
+
+def fitted_names(model):
+    """Training column names recorded by sklearn, XGBoost or LightGBM, if any."""
+    names = getattr(model, 'feature_names_in_', None)
+    if names is None and hasattr(model, 'get_booster'):
+        names = model.get_booster().feature_names
+    if names is None:
+        names = getattr(model, 'feature_name_', None)
+    return None if names is None else list(names)
+
+
+SCHEMAS = {
+    'target': Schema('target', TARGET_COLUMNS),
+    'score': Schema('score', SCORE_COLUMNS),
+    'hla': Schema('hla', HLA_COLUMNS),
+}
+
+# model name (models.MODEL_FILES) -> schema
+MODEL_SCHEMAS = {
+    'bagging': 'target', 'extratree': 'target', 'randomforest': 'target',
+    'xgb_score': 'score', 'lgb_score': 'score',
+    'extra_tree_hla': 'hla', 'xgbr_hla': 'hla', 'hist_hla': 'hla',
+}
@@ -0,0 +1,243 @@
+"""Local HTTP/JSON prediction service.
+
+Loads the models and reference once and serves predictions on localhost::
+
+    python service.py [--port 8000] [--batch-window-ms 5] [--max-batch-windows 65536] [--trace trace.json]
+
+    POST /predict  {"sequence": "...", "mhc_class": "MHC-1" | "MHC-2" | "BOTH", "id": "..."}
+    GET  /metrics  latency percentiles and throughput
+    GET  /health
+
+Windows from requests arriving within the batch window are scored together,
+one predict call per model, and the results are split back per request.
+"""
+import argparse
+import collections
+import json
+import queue
+import signal
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+from cache import normalize
+from features import check_sequence
+from models import missing_models, preload
+from pipeline import MODES, class_jobs, json_default, predict_heads_many, protein_record
+from reference import REFERENCE_PATH, load_reference
+from tracing import enable, span
+
+HOST = '127.0.0.1'
+LATENCY_SAMPLES = 10000
+
+
+class MicroBatcher:
+    """Collects jobs for up to ``window_seconds`` (or ``max_windows`` windows) and runs them as one batch."""
+
+    def __init__(self, reference, window_seconds=0.005, max_windows=65536):
+        self.reference = reference
+        self.window_seconds = window_seconds
+        self.max_windows = max_windows
+        self.batches = 0
+        self.batched_jobs = 0
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        threading.Thread(target=self._run, name='micro-batcher', daemon=True).start()
+
+    def submit(self, config, job, request_id=None):
+        future = Future()
+        self._queue.put((config, job, future, request_id))
+        return future
+
+    def _collect(self):
+        pending = [self._queue.get()]
+        windows = len(pending[0][1][2])
+        deadline = time.monotonic() + self.window_seconds
+        while windows < self.max_windows:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                pending.append(self._queue.get(timeout=timeout))
+            except queue.Empty:
+                break
+            windows += len(pending[-1][1][2])
+        return pending
+
+    def _run(self):
+        while True:
+            pending = self._collect()
+            groups = collections.defaultdict(list)
+            for config, job, future, request_id in pending:
+                groups[config].append((job, future, request_id))
+            for items in groups.values():
+                try:
+                    with span('batch', jobs=len(items), windows=sum(len(job[2]) for job, _, _ in items),
+                              request_ids=[request_id for _, _, request_id in items]):
+                        results = predict_heads_many(self.reference, [job for job, _, _ in items])
+                except Exception as error:
+                    if len(items) == 1:
+                        items[0][1].set_exception(error)
+                    else:
+                        # One bad job must not fail the requests it was batched with: find it by running each alone.
+                        self._run_each(items)
+                    continue
+                for (_, future, _), result in zip(items, results):
+                    future.set_result(result)
+            with self._lock:
+                self.batches += 1
+                self.batched_jobs += len(pending)
+
+    def _run_each(self, items):
+        for job, future, request_id in items:
+            try:
+                with span('batch', jobs=1, windows=len(job[2]), request_ids=[request_id], retry=True):
+                    future.set_result(predict_heads_many(self.reference, [job])[0])
+            except Exception as error:
+                future.set_exception(error)
+
+    def report(self):
+        with self._lock:
+            return {'batches': self.batches,
+                    'mean_batch_jobs': self.batched_jobs / self.batches if self.batches else 0.0}
+
+
+class ServiceStats:
+
+    def __init__(self):
+        self.started = time.monotonic()
+        self.requests = 0
+        self.errors = 0
+        self.windows = 0
+        self.latencies = collections.deque(maxlen=LATENCY_SAMPLES)
+        self._lock = threading.Lock()
+
+    def record(self, seconds, windows):
+        with self._lock:
+            self.requests += 1
+            self.windows += windows
+            self.latencies.append(seconds)
+
+    def record_error(self):
+        with self._lock:
+            self.errors += 1
+
+    def report(self):
+        with self._lock:
+            uptime = time.monotonic() - self.started
+            latencies = np.array(self.latencies)
+            return {
+                'requests': self.requests,
+                'errors': self.errors,
+                'windows': self.windows,
+                'uptime_seconds': uptime,
+                'requests_per_second': self.requests / uptime if uptime else 0.0,
+                'windows_per_second': self.windows / uptime if uptime else 0.0,
+                'latency_p50_ms': float(np.percentile(latencies, 50) * 1000) if len(latencies) else None,
+                'latency_p99_ms': float(np.percentile(latencies, 99) * 1000) if len(latencies) else None,
+            }
+
+
+def predict_request(batcher, body):
+    sequence = body.get('sequence')
+    mhc_class = body.get('mhc_class', 'BOTH')
+    # Whitespace removed and upper-cased as in the app, so FASTA-wrapped sequences are accepted.
+    sequence = normalize(sequence) if isinstance(sequence, str) else None
+    if not sequence:
+        raise ValueError("'sequence' must be a non-empty string")
+    if mhc_class not in MODES:
+        raise ValueError(f"'mhc_class' must be one of {', '.join(MODES)}")
+    # Rejected here, so an unscorable sequence never reaches a batch shared with other requests.
+    check_sequence(sequence)
+    request_id = uuid.uuid4().hex[:12]
+    with span('request', request_id=request_id, id=body.get('id'), mode=mhc_class, residues=len(sequence)):
+        configs, jobs = class_jobs(sequence, MODES[mhc_class])
+        futures = {config: batcher.submit(config, job, request_id) for config, job in jobs.items()}
+        results = {name: futures[config].result() for name, config in configs.items()}
+        return (protein_record(body.get('id'), sequence, results),
+                sum(len(result['final']) for result in results.values()))
+
+
+class Handler(BaseHTTPRequestHandler):
+    server_version = 'CancerProVax'
+
+    def _send(self, status, payload):
+        data = json.dumps(payload, default=json_default, allow_nan=False).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path == '/health':
+            self._send(200, {'status': 'ok'})
+        elif self.path == '/metrics':
+            self._send(200, dict(self.server.stats.report(), **self.server.batcher.report()))
+        else:
+            self._send(404, {'error': f"unknown path {self.path}"})
+
+    def do_POST(self):
+        if self.path != '/predict':
+            self._send(404, {'error': f"unknown path {self.path}"})
+            return
+        started = time.perf_counter()
+        try:
+            body = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+            if not isinstance(body, dict):
+                raise ValueError("request body must be a JSON object")
+            record, windows = predict_request(self.server.batcher, body)
+        except ValueError as error:
+            self.server.stats.record_error()
+            self._send(400, {'error': str(error)})
+            return
+        except Exception as error:
+            self.server.stats.record_error()
+            self._send(500, {'error': str(error)})
+            return
+        self.server.stats.record(time.perf_counter() - started, windows)
+        self._send(200, record)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def make_server(port=8000, batch_window_ms=5.0, max_batch_windows=65536, reference_path=REFERENCE_PATH):
+    reference = load_reference(reference_path)
+    preload()
+    server = ThreadingHTTPServer((HOST, port), Handler)
+    server.daemon_threads = True
+    server.batcher = MicroBatcher(reference, batch_window_ms / 1000.0, max_batch_windows)
+    server.stats = ServiceStats()
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve predictions over HTTP on localhost.")
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--batch-window-ms', type=float, default=5.0,
+                        help="how long to wait for other requests to share a model batch")
+    parser.add_argument('--max-batch-windows', type=int, default=65536)
+    parser.add_argument('--reference', default=REFERENCE_PATH)
+    parser.add_argument('--trace', help="write a Chrome trace-event JSON file on shutdown")
+    args = parser.parse_args()
+    if args.trace:
+        enable(args.trace)
+    missing = missing_models()
+    if missing:
+        raise SystemExit("Missing model files: " + ", ".join(missing))
+    server = make_server(args.port, args.batch_window_ms, args.max_batch_windows, args.reference)
+    # SIGTERM shuts down like Ctrl-C, so exit handlers such as the trace export still run.
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    print(f"Serving on http://{HOST}:{server.server_port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
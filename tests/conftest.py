@@ -0,0 +1,24 @@
+"""Puts the repository's flat modules on the path.
+
+Tests that need the model pickles and the reference artifact look for them
+in the working directory, as the app and the service do, and are skipped
+when they are missing::
+
+    cd <directory with the pickles> && python -m pytest <repo>/tests
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture(scope='session')
+def artifacts():
+    from models import MODEL_FILES
+    from reference import REFERENCE_PATH
+
+    missing = [path for path in [*MODEL_FILES.values(), REFERENCE_PATH] if not os.path.exists(path)]
+    if missing:
+        pytest.skip("missing in the working directory: " + ", ".join(missing))
@@ -0,0 +1,35 @@
+import io
+
+import numpy as np
+import pytest
+
+from batch import score_fasta
+from features import AMINO_ACIDS
+
+
+@pytest.fixture(scope='module')
+def fasta(tmp_path_factory):
+    rng = np.random.default_rng(0)
+    path = tmp_path_factory.mktemp('fasta') / 'proteins.fa'
+    # Shared stretches, so the workers compute and write many of the same peptides.
+    shared = ''.join(rng.choice(list(AMINO_ACIDS), 60))
+    with open(path, 'w') as handle:
+        for i in range(8):
+            own = ''.join(rng.choice(list(AMINO_ACIDS), int(rng.integers(30, 120))))
+            handle.write(f">p{i}\n{own}{shared}\n")
+    return str(path)
+
+
+def _score(fasta, **options):
+    out = io.StringIO()
+    score_fasta(fasta, out, 'MHC-1', **options)
+    return out.getvalue()
+
+
+@pytest.mark.parametrize('scan', [False, True])
+def test_workers_share_peptide_db(artifacts, fasta, tmp_path, scan):
+    expected = _score(fasta, scan=scan)
+    peptide_db = str(tmp_path / 'peptides.sqlite')
+    options = dict(scan=scan, chunk_windows=256, workers=3, peptide_db=peptide_db)
+    assert _score(fasta, **options) == expected
+    assert _score(fasta, **options) == expected
@@ -0,0 +1,59 @@
+import multiprocessing
+import sqlite3
+import time
+
+import numpy as np
+
+import peptides
+from features import AMINO_ACIDS, encode, window_stats
+from peptides import PeptideStore
+
+WINDOW = 9
+
+
+def _peptides(seed, count):
+    rng = np.random.default_rng(seed)
+    return [''.join(rng.choice(list(AMINO_ACIDS), WINDOW)) for _ in range(count)]
+
+
+def _write(path, worker):
+    # Half of every batch is shared with the other workers, half is the worker's own.
+    store = PeptideStore(path, bloom_bits=1 << 12)
+    for batch in range(20):
+        store.features(_peptides(batch, 25) + _peptides(1000 * (worker + 1) + batch, 25), WINDOW)
+
+
+def _block(path, locked, seconds):
+    PeptideStore(path)
+    db = sqlite3.connect(path)
+    db.execute("BEGIN IMMEDIATE")
+    locked.set()
+    time.sleep(seconds)
+    db.rollback()
+
+
+def test_forked_writers_wait_for_a_locked_database(tmp_path, monkeypatch):
+    # Shorter than the lock is held, so the writers go through the retry path, not only the busy timeout.
+    monkeypatch.setattr(peptides, 'SQLITE_TIMEOUT', 0.05)
+    path = str(tmp_path / 'peptides.sqlite')
+    context = multiprocessing.get_context('fork')
+    # No connection may be open in this process across the forks, so the lock is held from another one.
+    locked = context.Event()
+    blocker = context.Process(target=_block, args=(path, locked, 0.3))
+    blocker.start()
+    assert locked.wait(10)
+    workers = [context.Process(target=_write, args=(path, worker)) for worker in range(4)]
+    for worker in workers:
+        worker.start()
+    for worker in [blocker, *workers]:
+        worker.join()
+    assert [worker.exitcode for worker in workers] == [0] * len(workers)
+
+    expected = {peptide for batch in range(20) for peptide in _peptides(batch, 25)}
+    expected |= {peptide for worker in range(4) for batch in range(20)
+                 for peptide in _peptides(1000 * (worker + 1) + batch, 25)}
+    with sqlite3.connect(path) as db:
+        rows = dict(db.execute("SELECT peptide, features FROM peptides"))
+    assert set(rows) == expected
+    for peptide, blob in rows.items():
+        assert blob == window_stats(encode(peptide), np.arange(1), WINDOW)[0].tobytes()
@@ -0,0 +1,28 @@
+import numpy as np
+import pytest
+
+from reference import _nearest_exact, build_hla_index, nearest_hla
+
+
+def _random_hla(rng, count):
+    letters = np.array(list('ACDEFGHIKLMNPQRSTVWY'))
+    return [f"{''.join(rng.choice(letters, rng.integers(1, 4)))}{rng.integers(0, 30)}"
+            + (f"/{''.join(rng.choice(letters, 2))}{rng.integers(0, 9)}" if rng.random() < 0.3 else '')
+            for _ in range(count)]
+
+
+@pytest.mark.parametrize('seed', range(20))
+@pytest.mark.parametrize('k', [1, 3, 10])
+def test_nearest_hla_matches_stable_sort(seed, k):
+    rng = np.random.default_rng(seed)
+    index = build_hla_index(_random_hla(rng, int(rng.integers(1, 60))), k=k)
+    scores = index['scores']
+    values = np.concatenate([
+        rng.choice(scores, 20),
+        rng.choice(scores, 20) + rng.normal(0, 5, 20),
+        rng.uniform(scores.min() - 100, scores.max() + 100, 20),
+        [np.nan, np.inf, -np.inf, 1e308, -1e308],
+    ])
+    rng.shuffle(values)
+    expected = [list(index['strings'][_nearest_exact(index, value)]) for value in values]
+    assert nearest_hla(index, values) == expected
@@ -0,0 +1,53 @@
+import json
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+from service import make_server, predict_request
+
+SEQUENCE = 'MKVLLAGHTRWQEDSLLKACDEFGHIKLMNPQRSTVWY'
+
+
+@pytest.fixture(scope='module')
+def server(artifacts):
+    server = make_server(0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _post(server, body):
+    request = urllib.request.Request(f'http://127.0.0.1:{server.server_port}/predict', json.dumps(body).encode())
+    try:
+        with urllib.request.urlopen(request) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as error:
+        return error.code, json.loads(error.read())
+
+
+@pytest.mark.parametrize('sequence', [None, '', ' \n\t '])
+def test_empty_sequence_rejected(sequence):
+    with pytest.raises(ValueError, match='non-empty'):
+        predict_request(None, {'sequence': sequence})
+
+
+def test_whitespace_not_reported_as_residue():
+    with pytest.raises(ValueError, match='non-standard residues X '):
+        predict_request(None, {'sequence': 'MKVLL AGX\nHTRW'})
+
+
+def test_wrapped_sequence_scored_like_app(server):
+    wrapped = '\n'.join(SEQUENCE[i:i + 10].lower() for i in range(0, len(SEQUENCE), 10)) + '\n'
+    status, record = _post(server, {'sequence': f'  {wrapped}', 'mhc_class': 'MHC-1'})
+    assert status == 200
+    assert record == _post(server, {'sequence': SEQUENCE, 'mhc_class': 'MHC-1'})[1]
+    assert record['length'] == len(SEQUENCE)
+
+
+def test_invalid_sequence_is_400(server):
+    status, body = _post(server, {'sequence': 'MKVLLAGXHTRW', 'mhc_class': 'MHC-1'})
+    assert status == 400
+    assert 'non-standard residues X' in body['error']
@@ -0,0 +1,146 @@
+"""Hierarchical timing spans with a Chrome trace-event export.
+
+Tracing is off unless ``CANCERPROVAX_TRACE`` names an output file (or
+``enable`` is called). Spans then record their name, thread, request id,
+parent span and attributes, and ``flush`` writes them as trace-event JSON
+that chrome://tracing and https://ui.perfetto.dev open directly::
+
+    CANCERPROVAX_TRACE=trace.json streamlit run app.py
+    python batch.py proteins.fasta --trace trace.json
+
+While tracing is off, ``span`` returns one shared no-op context manager.
+"""
+import atexit
+import contextlib
+import contextvars
+import itertools
+import json
+import os
+import tempfile
+import threading
+import time
+
+TRACE_PATH = os.environ.get('CANCERPROVAX_TRACE')
+MAX_EVENTS = 1_000_000
+
+_tracer = None
+_disabled = contextlib.nullcontext()
+# (request id, span id) of the innermost open span in this context
+_current = contextvars.ContextVar('cancerprovax_span', default=None)
+
+
+class Tracer:
+
+    def __init__(self, path=None, max_events=MAX_EVENTS):
+        self.path = path
+        self.max_events = max_events
+        self.events = []
+        self.dropped = 0
+        self._threads = {}
+        self._ids = itertools.count(1)
+        self._origin = time.perf_counter_ns()
+        self._lock = threading.Lock()
+
+    def record(self, name, start_ns, end_ns, args):
+        thread = threading.current_thread()
+        event = {'name': name, 'cat': 'cancerprovax', 'ph': 'X', 'pid': os.getpid(), 'tid': thread.ident,
+                 'ts': (start_ns - self._origin) / 1000, 'dur': (end_ns - start_ns) / 1000, 'args': args}
+        with self._lock:
+            if len(self.events) >= self.max_events:
+                self.dropped += 1
+                return
+            self._threads.setdefault(thread.ident, thread.name)
+            self.events.append(event)
+
+    def trace(self):
+        with self._lock:
+            threads = [{'name': 'thread_name', 'ph': 'M', 'pid': os.getpid(), 'tid': tid, 'args': {'name': name}}
+                       for tid, name in self._threads.items()]
+            return {'traceEvents': threads + list(self.events), 'displayTimeUnit': 'ms',
+                    'otherData': {'dropped_events': self.dropped}}
+
+    def write(self, path=None):
+        path = path or self.path
+        directory = os.path.dirname(os.path.abspath(path))
+        descriptor, temporary = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        with os.fdopen(descriptor, 'w') as handle:
+            json.dump(self.trace(), handle, default=str)
+        os.replace(temporary, path)
+        return path
+
+
+@contextlib.contextmanager
+def _span(tracer, name, attributes):
+    parent = _current.get()
+    request_id = attributes.pop('request_id', None) or (parent[0] if parent else None)
+    span_id = next(tracer._ids)
+    token = _current.set((request_id, span_id))
+    started = time.perf_counter_ns()
+    try:
+        yield
+    except BaseException as error:
+        attributes['error'] = repr(error)
+        raise
+    finally:
+        ended = time.perf_counter_ns()
+        _current.reset(token)
+        tracer.record(name, started, ended, dict(attributes, request_id=request_id, span_id=span_id,
+                                                 parent_id=parent[1] if parent else None))
+
+
+def span(name, **attributes):
+    """Context manager timing ``name`` as a child of the enclosing span; pass ``request_id`` on the root span."""
+    tracer = _tracer
+    if tracer is None:
+        return _disabled
+    return _span(tracer, name, attributes)
+
+
+def enabled():
+    return _tracer is not None
+
+
+def enable(path=None, max_events=MAX_EVENTS):
+    """Starts recording spans; ``flush`` and interpreter exit write them to ``path``."""
+    global _tracer
+    first = _tracer is None
+    _tracer = Tracer(path, max_events)
+    if first:
+        atexit.register(flush)
+    return _tracer
+
+
+def disable():
+    global _tracer
+    _tracer = None
+
+
+def flush():
+    """Writes the spans recorded so far to the tracer's file; returns the path, or None when there is none."""
+    tracer = _tracer
+    if tracer is None or not tracer.path:
+        return None
+    return tracer.write()
+
+
+def fork_child():
+    """In a forked worker: drops the parent's spans and records the worker's own for ``<stem>.<pid><ext>``.
+
+    Returns the worker's trace path, or None when tracing is off or has no file. The caller flushes it.
+    """
+    global _tracer
+    tracer = _tracer
+    if tracer is None:
+        return None
+    root, ext = os.path.splitext(tracer.path or '')
+    _tracer = Tracer(f"{root}.{os.getpid()}{ext}" if tracer.path else None, tracer.max_events)
+    return _tracer.path
+
+
+def submit(pool, fn, *args):
+    """``pool.submit`` that keeps the caller's span as the parent of spans opened in the worker thread."""
+    return pool.submit(contextvars.copy_context().run, fn, *args)
+
+
+if TRACE_PATH:
+    enable(TRACE_PATH)
@@ -0,0 +1,202 @@
+"""Tree ensembles compiled to flat leaf tables.
+
+``compile_model`` turns a fitted Bagging, RandomForest or ExtraTrees
+classifier, or a RandomForest or ExtraTrees regressor, into a
+``CompiledForest``. The compiled form holds every tree's leaf values end to
+end in one contiguous array, pre-normalized the way sklearn normalizes them
+on each call, with per-tree node offsets. A prediction casts the input to
+float32 once, finds each tree's leaves with the tree's own compiled
+``apply``, and adds the leaf rows in sklearn's order, so the output is
+bit-identical. It skips sklearn's per-estimator validation, joblib dispatch
+and per-call normalization.
+
+Every compiled model is checked on load against the original on probe rows
+built around its split thresholds; if anything differs, or the ensemble is
+not one of the supported kinds, the original model is used. Only the models
+in ``models.COMPILED_MODELS`` are compiled: those the timing report below
+shows at least ``MIN_SPEEDUP`` times faster both on one row and on
+``GATE_ROWS`` rows, the largest batch the pipeline predicts at once.
+HistGradientBoosting is not compiled: sklearn already predicts it from flat
+node arrays in compiled code. Timing report::
+
+    python trees.py [--sizes 1 70 1000 10000] [--repeats 5]
+"""
+import argparse
+import time
+
+import numpy as np
+
+PROBE_ROWS = 512
+# Worth compiling only if at least this much faster than the original on one row and on GATE_ROWS rows.
+MIN_SPEEDUP = 1.1
+GATE_ROWS = 8192
+GATE_REPEATS = 3
+
+
+class CompiledForest:
+
+    def __init__(self, model, trees, features, leaf_values, divisor, classes=None):
+        self.model = model
+        self.n_features_in_ = model.n_features_in_
+        self.trees = trees
+        self.features = features
+        self.offsets = np.cumsum([0] + [tree.node_count for tree in trees[:-1]])
+        self.leaf_values = np.ascontiguousarray(np.concatenate(leaf_values))
+        self.divisor = divisor
+        self.classes = classes
+
+    def predict(self, X):
+        X = np.asarray(X)
+        if X.ndim != 2 or X.shape[1] != self.n_features_in_:
+            return self.model.predict(X)
+        X32 = np.ascontiguousarray(X, dtype=np.float32)
+        if not np.isfinite(X32).all():
+            # sklearn rejects these; let it raise its own error.
+            return self.model.predict(X)
+        total = np.zeros((len(X32),) + self.leaf_values.shape[1:])
+        for tree, features, offset in zip(self.trees, self.features, self.offsets):
+            leaves = tree.apply(X32 if features is None else np.ascontiguousarray(X32[:, features]))
+            total += self.leaf_values[leaves + offset]
+        total /= self.divisor
+        if self.classes is None:
+            return total
+        return self.classes.take(np.argmax(total, axis=1), axis=0)
+
+
+def _proba_leaves(estimator, n_classes):
+    # DecisionTreeClassifier.predict_proba's normalization, done once per leaf instead of once per row.
+    values = estimator.tree_.value[:, 0, :estimator.n_classes_]
+    normalizer = values.sum(axis=1)[:, np.newaxis]
+    normalizer[normalizer == 0.0] = 1.0
+    proba = values / normalizer
+    if estimator.n_classes_ == n_classes:
+        return proba
+    # A bagged tree that saw only some classes adds to those columns only.
+    padded = np.zeros((len(proba), n_classes))
+    padded[:, estimator.classes_.astype(int)] = proba
+    return padded
+
+
+def _compile(model):
+    from sklearn.ensemble import (BaggingClassifier, ExtraTreesClassifier, ExtraTreesRegressor,
+                                  RandomForestClassifier, RandomForestRegressor)
+    from sklearn.tree import BaseDecisionTree
+
+    # With several jobs sklearn sums the trees in a different (or nondeterministic) order.
+    if getattr(model, 'n_jobs', None) not in (None, 1):
+        return None
+    if isinstance(model, BaggingClassifier):
+        estimators = model.estimators_
+        if not all(isinstance(estimator, BaseDecisionTree) and estimator.n_outputs_ == 1 for estimator in estimators):
+            return None
+        n_features = model.n_features_in_
+        features = [None if np.array_equal(columns, np.arange(n_features)) else np.asarray(columns)
+                    for columns in model.estimators_features_]
+        return CompiledForest(model, [estimator.tree_ for estimator in estimators], features,
+                              [_proba_leaves(estimator, model.n_classes_) for estimator in estimators],
+                              model.n_estimators, model.classes_)
+    if isinstance(model, (RandomForestClassifier, ExtraTreesClassifier)):
+        if model.n_outputs_ != 1:
+            return None
+        estimators = model.estimators_
+        return CompiledForest(model, [estimator.tree_ for estimator in estimators], [None] * len(estimators),
+                              [_proba_leaves(estimator, model.n_classes_) for estimator in estimators],
+                              len(estimators), model.classes_)
+    if isinstance(model, (RandomForestRegressor, ExtraTreesRegressor)):
+        if model.n_outputs_ != 1:
+            return None
+        estimators = model.estimators_
+        return CompiledForest(model, [estimator.tree_ for estimator in estimators], [None] * len(estimators),
+                              [estimator.tree_.value[:, 0, 0] for estimator in estimators], len(estimators))
+    return None
+
+
+def probe_rows(compiled, rows=PROBE_ROWS, seed=0):
+    """Rows whose values sit on, just above and just below the ensemble's split thresholds."""
+    thresholds = [[] for _ in range(compiled.n_features_in_)]
+    for tree, features in zip(compiled.trees, compiled.features):
+        split = tree.children_left >= 0
+        columns = tree.feature[split] if features is None else features[tree.feature[split]]
+        for column, threshold in zip(columns, tree.threshold[split]):
+            thresholds[column].append(threshold)
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(rows, compiled.n_features_in_))
+    for column, values in enumerate(thresholds):
+        if values:
+            picked = np.asarray(values)[rng.integers(0, len(values), rows)]
+            nearest = picked.astype(np.float32)
+            choices = np.stack([picked, nearest, np.nextafter(nearest, np.float32(np.inf)),
+                                np.nextafter(nearest, np.float32(-np.inf))], axis=1).astype(np.float64)
+            X[:, column] = choices[np.arange(rows), rng.integers(0, 4, rows)]
+    return X
+
+
+def _checked(model):
+    # The compiled form if it predicts bit-identically to ``model`` on probe rows, else None.
+    try:
+        compiled = _compile(model)
+    except (AttributeError, ValueError):
+        return None
+    if compiled is None:
+        return None
+    X = probe_rows(compiled)
+    expected = np.asarray(model.predict(X))
+    actual = compiled.predict(X)
+    if expected.dtype != actual.dtype or expected.tobytes() != actual.tobytes():
+        return None
+    return compiled
+
+
+def speedup(model, compiled, rows=GATE_ROWS, repeats=GATE_REPEATS):
+    """The smaller of the original/compiled predict-time ratios on one row and on ``rows`` rows."""
+    X = probe_rows(compiled, rows, seed=1)
+    return min(_best_seconds(model.predict, X[:size], repeats) / _best_seconds(compiled.predict, X[:size], repeats)
+               for size in (1, rows))
+
+
+def compile_model(model):
+    """A ``CompiledForest`` for ``model`` if it gives bit-identical predictions on probe rows, else ``model``."""
+    compiled = _checked(model)
+    return model if compiled is None else compiled
+
+
+def _best_seconds(predict, X, repeats):
+    best = float('inf')
+    for _ in range(repeats):
+        started = time.perf_counter()
+        predict(X)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def timing_report(sizes=(1, 70, 1000, 10000), repeats=5, model_dir='.'):
+    import joblib
+
+    from models import COMPILED_MODELS, MODEL_FILES, missing_models, model_path
+
+    for name in MODEL_FILES:
+        if missing_models([name], model_dir):
+            continue
+        model = joblib.load(model_path(name, model_dir))
+        compiled = _checked(model)
+        if compiled is None:
+            print(f"{name}: {type(model).__name__} not compiled")
+            continue
+        X = np.resize(probe_rows(compiled, max(sizes)), (max(sizes), compiled.n_features_in_))
+        print(f"{name}: {type(model).__name__}, {len(compiled.trees)} trees, {len(compiled.leaf_values)} nodes")
+        for size in sizes:
+            original = _best_seconds(model.predict, X[:size], repeats)
+            fast = _best_seconds(compiled.predict, X[:size], repeats)
+            print(f"{size:>8} rows {original * 1000:9.2f} ms -> {fast * 1000:9.2f} ms ({original / fast:4.1f}x)")
+        gain = speedup(model, compiled, repeats=repeats)
+        print(f"{'':>8} {gain:.2f}x at worst of 1 and {GATE_ROWS} rows, "
+              f"{'worth' if gain >= MIN_SPEEDUP else 'not worth'} compiling; "
+              f"{'in' if name in COMPILED_MODELS else 'not in'} models.COMPILED_MODELS")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare compiled and original tree-ensemble predict times.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1, 70, 1000, 10000])
+    parser.add_argument('--repeats', type=int, default=5)
+    args = parser.parse_args()
+    timing_report(args.sizes, args.repeats)